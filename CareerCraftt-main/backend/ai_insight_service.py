@@ -4,11 +4,15 @@ import logging
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from resume_sections import pack_sections
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def generate_market_intelligence(resume_content: str, job_description: str, job_title: str) -> dict:
+# Resume budget inside the prompt; longer resumes are packed section by section (see resume_sections.py)
+MAX_RESUME_PROMPT_CHARS = 15000
+
+def generate_market_intelligence(resume_content: str, job_description: str, job_title: str, sections: list = None) -> dict:
     """
     Generates deep market intelligence using Groq (Llama 3).
     Returns:
@@ -59,7 +63,7 @@ def generate_market_intelligence(resume_content: str, job_description: str, job_
     {job_description[:3000]}
     
     Resume Context:
-    {resume_content[:15000]}
+    {pack_sections(resume_content, sections, MAX_RESUME_PROMPT_CHARS)}
     
     GOAL: Provide actionable, strategic insights. Be critical but constructive.
     
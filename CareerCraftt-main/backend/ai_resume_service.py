@@ -2,10 +2,14 @@ import os
 import json
 import logging
 import requests
+from resume_sections import pack_sections
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Resume budget inside the prompt; longer resumes are packed section by section (see resume_sections.py)
+MAX_RESUME_PROMPT_CHARS = 15000
+
 def analyze_resume_gemini(resume_content: str, job_description: str = "", job_title: str = "", **kwargs) -> dict:
     """
     Analyzes a resume using Groq Cloud API (Llama 3).
@@ -69,6 +73,14 @@ def analyze_resume_gemini(resume_content: str, job_description: str = "", job_ti
     if job_description:
         job_context += f"\nJob Description Consideration:\n{job_description[:2000]}"
 
+    # Keep whole sections by priority instead of cutting the tail off.
+    # Cached section offsets are only valid if strip() removed nothing.
+    if isinstance(clean_text, str):
+        sections = kwargs.get("sections") if clean_text == resume_content else None
+        resume_prompt_text = pack_sections(clean_text, sections, MAX_RESUME_PROMPT_CHARS)
+    else:
+        resume_prompt_text = clean_text[:MAX_RESUME_PROMPT_CHARS]
+
     prompt = f"""
     You are an expert ATS (Applicant Tracking System) Resume Analyzer.
     Analyze the following resume text against the refined criteria.
@@ -79,7 +91,7 @@ def analyze_resume_gemini(resume_content: str, job_description: str = "", job_ti
     2. SCORING: All scores must be between 0 and 100. (e.g., 85, not 8.5).
     
     Resume Text:
-    {clean_text[:15000]}  # Truncate to avoid context limits if necessary
+    {resume_prompt_text}
     
     Output JSON Structure:
     {json_structure}
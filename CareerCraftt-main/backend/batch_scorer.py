@@ -0,0 +1,195 @@
+import math
+import logging
+import threading
+
+import numpy as np
+from scipy import sparse
+
+# Vectorized one-resume-vs-N-jobs version of the hybrid ATS formula in
+# resume_analysis (tfidf_cosine + hybrid_score). All jobs are scored with a
+# few sparse matrix products instead of one Python loop iteration per job.
+
+logger = logging.getLogger(__name__)
+
+# idf in the two-document TfidfVectorizer fit (see resume_analysis.SINGLE_DOC_IDF)
+SINGLE_DOC_IDF = math.log(1.5) + 1
+# Rebuild the term vocabulary when it grows past this (evicted JDs leave terms behind)
+MAX_VOCABULARY = 200_000
+MAX_MISSING_KEYWORDS = 15
+
+
+class TermVocabulary:
+    """Thread-safe term -> column id map shared by all cached JD profiles."""
+
+    def __init__(self, max_size=MAX_VOCABULARY):
+        self.max_size = max_size
+        self.generation = 0
+        self._ids = {}
+        self.terms = []
+        self._lock = threading.Lock()
+
+    def encode(self, terms):
+        """Column ids for terms, adding unseen ones."""
+        with self._lock:
+            if len(self._ids) > self.max_size:
+                self._ids = {}
+                self.terms = []
+                self.generation += 1
+                logger.info(f"Batch scorer vocabulary reset (generation {self.generation})")
+            ids = []
+            for term in terms:
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    term_id = len(self.terms)
+                    self._ids[term] = term_id
+                    self.terms.append(term)
+                ids.append(term_id)
+            return np.asarray(ids, dtype=np.int64)
+
+    def snapshot(self):
+        """(generation, term -> id map, id -> term list, size); consistent for one scoring pass."""
+        with self._lock:
+            return self.generation, self._ids, self.terms, len(self.terms)
+
+
+vocabulary = TermVocabulary()
+
+
+def _encoded(profile):
+    """
+    Column ids of a JD profile's TF-IDF terms and keywords, memoized on the
+    (cached) profile dict itself and re-encoded after a vocabulary reset.
+    """
+    cached = profile.get("_encoded")
+    if cached is not None and cached[0] == vocabulary.generation:
+        return cached
+    counts = profile["term_counts"]
+    terms = list(counts)
+    keywords = sorted(profile["keywords"])
+    cached = (
+        vocabulary.generation,
+        vocabulary.encode(terms),
+        np.fromiter((counts[t] for t in terms), dtype=np.float64, count=len(terms)),
+        vocabulary.encode(keywords),
+    )
+    profile["_encoded"] = cached
+    return cached
+
+
+def _lookup(ids_map, size, terms):
+    """(ids, positions) of the terms known to the snapshot; never adds."""
+    ids, positions = [], []
+    for pos, term in enumerate(terms):
+        term_id = ids_map.get(term)
+        if term_id is not None and term_id < size:
+            ids.append(term_id)
+            positions.append(pos)
+    return np.asarray(ids, dtype=np.int64), np.asarray(positions, dtype=np.int64)
+
+
+def _rows(encoded, column, size, values=None):
+    """CSR matrix with one row per job from per-job column id arrays."""
+    indptr = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e[column]) for e in encoded], out=indptr[1:])
+    indices = np.concatenate([e[column] for e in encoded]) if encoded else np.zeros(0, dtype=np.int64)
+    if values is None:
+        data = np.ones(len(indices), dtype=np.float64)
+    else:
+        data = np.concatenate([e[values] for e in encoded]) if encoded else np.zeros(0, dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(encoded), size))
+
+
+def _model_tfidf(model, resume_counts, profiles):
+    """Cosine under a fitted corpus model (tfidf_model.CorpusTfidfModel), 0-100, for every profile."""
+    vectors = []
+    for profile in profiles:
+        cached = profile.get("_model_vector")
+        if cached is None or cached[0] != model.generation:
+            cached = (model.generation, *model.vector(profile["term_counts"]))
+            profile["_model_vector"] = cached
+        vectors.append(cached)
+    M = _rows(vectors, 1, len(model.index), values=2)
+    ids, weights = model.vector(resume_counts)
+    r = np.zeros(len(model.index))
+    r[ids] = weights
+    return (M @ r) * 100
+
+
+def _pair_tfidf(encoded, size, r, total_sq):
+    """
+    Cosine of each [resume, jd] two-document fit, 0-100 (see resume_analysis.tfidf_cosine):
+    idf 1 for shared terms, SINGLE_DOC_IDF otherwise.
+    """
+    J = _rows(encoded, 1, size, values=2)
+    c2 = SINGLE_DOC_IDF ** 2
+    present = J.copy()
+    present.data[:] = 1.0
+    dot = J @ r                                   # only shared terms contribute
+    shared_r_sq = present @ (r * r)               # sum of r_t^2 over terms also in the JD
+    r_norm_sq = c2 * total_sq - (c2 - 1) * shared_r_sq
+    shared_mask = present.multiply(r > 0).tocsr()
+    j_sq = J.multiply(J).tocsr()
+    shared_j_sq = np.asarray(j_sq.multiply(shared_mask).sum(axis=1)).ravel()
+    j_norm_sq = c2 * np.asarray(j_sq.sum(axis=1)).ravel() - (c2 - 1) * shared_j_sq
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(dot > 0, dot / (np.sqrt(r_norm_sq) * np.sqrt(j_norm_sq)) * 100, 0.0)
+
+
+def score_jobs(resume_tokens, resume_counts, profiles, model=None):
+    """
+    Hybrid score of one resume against every JD profile (resume_analysis.jd_profile).
+    resume_tokens: the resume's keyword token set; resume_counts: its TF-IDF term counts.
+    model: a fitted corpus TF-IDF model; None keeps the two-document fit.
+    Returns [(score, missing_keywords_list)], same as resume_analysis.hybrid_score()
+    applied to tfidf_cosine() (or model.cosine()) for each profile.
+    """
+    if not profiles:
+        return []
+    # Encoding may grow (or reset) the vocabulary, so do it before sizing the matrices
+    while True:
+        encoded = [_encoded(p) for p in profiles]
+        generation, ids_map, id_terms, size = vocabulary.snapshot()
+        if all(e[0] == generation for e in encoded):
+            break
+
+    # Resume as dense vectors over the vocabulary. Resume terms no JD uses are
+    # never shared, so they only enter the resume norm (via total_sq).
+    terms = list(resume_counts)
+    values = np.fromiter((resume_counts[t] for t in terms), dtype=np.float64, count=len(terms))
+    ids, positions = _lookup(ids_map, size, terms)
+    r = np.zeros(size)
+    r[ids] = values[positions]
+    total_sq = float(np.dot(values, values))
+
+    token_ids, _ = _lookup(ids_map, size, list(resume_tokens))
+    has_token = np.zeros(size)
+    has_token[token_ids] = 1.0
+
+    # 1. TF-IDF cosine
+    if model is not None:
+        tfidf = _model_tfidf(model, resume_counts, profiles)
+    else:
+        tfidf = _pair_tfidf(encoded, size, r, total_sq)
+
+    # 2. Keyword overlap
+    K = _rows(encoded, 3, size)
+    keyword_totals = np.diff(K.indptr)
+    matched = K @ has_token
+    missing = K.multiply(1.0 - has_token).tocsr()
+    missing.eliminate_zeros()
+
+    # 3. Hybrid formula, element-wise
+    with np.errstate(divide="ignore", invalid="ignore"):
+        keyword_score = matched / keyword_totals * 100
+    final = np.where(tfidf < 15, keyword_score, 0.8 * keyword_score + 0.2 * tfidf)
+    final = np.minimum(final, 96.0)
+
+    results = []
+    for i in range(len(profiles)):
+        if not keyword_totals[i]:
+            results.append((round(float(tfidf[i]), 2), []))
+            continue
+        row = missing.indices[missing.indptr[i]:missing.indptr[i + 1]]
+        names = sorted(id_terms[t].capitalize() for t in row)
+        results.append((round(float(final[i]), 1), names[:MAX_MISSING_KEYWORDS]))
+    return results
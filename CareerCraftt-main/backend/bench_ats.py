@@ -0,0 +1,240 @@
+"""
+ATS scoring golden set + throughput benchmark.
+
+ats_golden.json holds resume / JD pairs with the score and missing keywords
+/analyze-resume produced when it was recorded: score_resume() with the
+resume's segment_resume() sections, as the endpoint calls it. Every scorer
+(that reference path and the accelerated ones) is run over all pairs and
+checked against it, so tuning the hybrid formula (80/20
+weighting, 15% TF-IDF cutoff, 96% cap) or optimizing a scorer cannot
+silently change scores.
+
+Reports, per scorer: pairs/s and drift vs the golden set (pairs whose score
+or missing keywords differ, largest score difference). For the reference
+scorer it also breaks the cost of one pair down by stage: spaCy (JD tagging
++ resume tokens), TF-IDF (term counts + cosine) and keyword diff.
+
+Scores use the two-document TF-IDF fit, whatever corpus model
+(tfidf_model.py) is on disk. JD keywords come from the spaCy model's POS
+tags, so the golden set records the model and pipeline components it was
+made with (the run refuses to record or check without a tagger); re-record
+after changing the model or on purpose changing the formula.
+
+Usage:
+    python bench_ats.py                      # check + benchmark against ats_golden.json
+    python bench_ats.py --repeat 5 --out bench_ats_results.json
+    python bench_ats.py --record             # rewrite ats_golden.json from the current scorer
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+from resume_analysis import (
+    nlp, nlp_fingerprint, jd_cache, score_resume, analyze_content_batch, jd_profile, resume_tokens, term_counts,
+    tfidf_cosine, jd_keywords_from_doc, hybrid_score,
+)
+from resume_features import compute_resume_features, load_features
+from student_index import StudentIndexStore
+from tfidf_model import tfidf_store
+from bench_nlp import make_jds, sample_resume
+from bench_quality import make_resumes
+from resume_sections import segment_resume
+
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ats_golden.json")
+SCORERS = ("score_resume", "analyze_content_batch", "batch_with_features", "student_index")
+
+# Hand-written cases the generated corpus does not cover
+EDGE_RESUMES = [
+    "Priya Sharma\npriya@example.com\nSkills\nML, NLP, k8s, JS, Node.js, Postgres, CI/CD, REST APIs\n"
+    "Experience\nBuilt machine learning pipelines and deployed them on Google Cloud with Docker.",
+    "Short resume. Java.",
+]
+EDGE_JDS = [
+    "Machine Learning Engineer: deep learning, natural language processing, PyTorch, Kubernetes, AWS.",
+    "Frontend developer with React.js, TypeScript, JavaScript and GraphQL experience.",
+    "We are looking for good people.",
+    "Python",
+]
+
+
+def pin_pair_tfidf():
+    # The golden scores are for the [resume, jd] pair fit: ignore any fitted corpus model
+    tfidf_store.model = None
+    tfidf_store.model_dir = os.devnull
+
+
+def model_name():
+    return nlp_fingerprint()
+
+
+def make_golden():
+    resumes = [sample_resume()] + make_resumes(21, seed=11) + EDGE_RESUMES
+    jds = make_jds(6) + EDGE_JDS
+    sections = [segment_resume(resume) for resume in resumes]
+    pairs = []
+    for r, resume in enumerate(resumes):
+        for j, jd in enumerate(jds):
+            score, missing = endpoint_score(resume, sections[r], jd)
+            pairs.append({"resume": r, "jd": j, "score": score, "missing_keywords": missing})
+    return {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "spacy_model": model_name(),
+        "resumes": resumes,
+        "jds": jds,
+        "pairs": pairs,
+    }
+
+
+def endpoint_score(resume, sections, jd):
+    """(score, missing_keywords) the way /analyze-resume computes them."""
+    score, missing, _ = score_resume(resume, jd, sections)
+    return score, missing
+
+
+# --- scorers: each returns {(resume index, jd index): (score, missing_keywords)} ---
+def score_single(golden, sections):
+    return {
+        (r, j): endpoint_score(resume, sections[r], jd)
+        for r, resume in enumerate(golden["resumes"]) for j, jd in enumerate(golden["jds"])
+    }
+
+
+def score_batch(golden):
+    out = {}
+    for r, resume in enumerate(golden["resumes"]):
+        for j, result in enumerate(analyze_content_batch(resume, golden["jds"])):
+            out[(r, j)] = result
+    return out
+
+
+def score_batch_features(golden, features):
+    out = {}
+    for r, resume in enumerate(golden["resumes"]):
+        for j, result in enumerate(analyze_content_batch(resume, golden["jds"], features=features[r])):
+            out[(r, j)] = result
+    return out
+
+
+def score_student_index(golden, index):
+    out = {}
+    for j, jd in enumerate(golden["jds"]):
+        for ranked in index.rank(jd_profile(jd), top_k=len(index)):
+            out[(int(ranked["uid"]), j)] = (ranked["score"], ranked["missing_keywords"])
+    return out
+
+
+def drift(golden, results):
+    score_diffs, keyword_diffs, max_diff = 0, 0, 0.0
+    for pair in golden["pairs"]:
+        score, missing = results[(pair["resume"], pair["jd"])]
+        diff = abs(score - pair["score"])
+        max_diff = max(max_diff, diff)
+        score_diffs += diff > 1e-9
+        keyword_diffs += list(missing) != pair["missing_keywords"]
+    return {"score_diffs": score_diffs, "keyword_diffs": keyword_diffs, "max_score_diff": round(max_diff, 4)}
+
+
+def stage_costs(golden):
+    """ms per pair of each analyze_content() stage on a cold JD cache."""
+    totals = {"spacy": 0.0, "tfidf": 0.0, "keyword_diff": 0.0}
+    for resume in golden["resumes"]:
+        for jd in golden["jds"]:
+            t0 = time.perf_counter()
+            jd_doc = nlp(jd)
+            tokens = resume_tokens(resume)
+            t1 = time.perf_counter()
+            tfidf_score = tfidf_cosine(term_counts(resume), term_counts(jd))
+            t2 = time.perf_counter()
+            hybrid_score(tfidf_score, tokens, jd_keywords_from_doc(jd_doc))
+            t3 = time.perf_counter()
+            totals["spacy"] += t1 - t0
+            totals["tfidf"] += t2 - t1
+            totals["keyword_diff"] += t3 - t2
+    n = len(golden["pairs"])
+    return {stage: round(seconds / n * 1000, 3) for stage, seconds in totals.items()}
+
+
+def timed(fn, *args, repeat=1, cold=True):
+    """(result, seconds): best of repeat runs, the JD cache cleared before each when cold."""
+    best, result = None, None
+    for _ in range(repeat):
+        if cold:
+            jd_cache.clear()
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--golden", default=GOLDEN_FILE)
+    parser.add_argument("--record", action="store_true", help="Rewrite the golden set from the current scorer")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+    pin_pair_tfidf()
+    # Without a tagger every token is a NOUN: the keywords would be recorded / checked wrong
+    if "tagger" not in nlp.pipe_names:
+        print(f"❌ {model_name()} has no tagger; install the full en_core_web_sm to record or check the golden set")
+        return 2
+
+    if args.record:
+        golden = make_golden()
+        with open(args.golden, "w", encoding="utf-8") as f:
+            json.dump(golden, f, indent=1, ensure_ascii=False)
+        print(f"✅ Recorded {len(golden['pairs'])} pairs ({golden['spacy_model']}) -> {args.golden}")
+        return 0
+
+    if not os.path.exists(args.golden):
+        print(f"❌ No golden set at {args.golden}; record one with --record")
+        return 2
+    with open(args.golden, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    if model_name() != golden["spacy_model"]:
+        print(f"❌ Golden set recorded with {golden['spacy_model']}, running {model_name()}: re-record it with --record")
+        return 2
+    n = len(golden["pairs"])
+    print(f"📚 {len(golden['resumes'])} resumes x {len(golden['jds'])} JDs = {n} pairs")
+
+    sections = [segment_resume(resume) for resume in golden["resumes"]]
+    features = [load_features(compute_resume_features(resume)) for resume in golden["resumes"]]
+    with tempfile.TemporaryDirectory(prefix="bench_ats_") as tmp:
+        index = StudentIndexStore(tmp).build("bench", [{"uid": str(r), "features": f} for r, f in enumerate(features)])
+        runs = {
+            "score_resume": timed(score_single, golden, sections, repeat=args.repeat),
+            "analyze_content_batch": timed(score_batch, golden, repeat=args.repeat),
+            "batch_with_features": timed(score_batch_features, golden, features, repeat=args.repeat),
+            "student_index": timed(score_student_index, golden, index, repeat=args.repeat),
+        }
+    results = []
+    print(f"\n{'scorer':<22} {'pairs/s':>10} {'score diffs':>12} {'kw diffs':>9} {'max diff':>9}")
+    for name in SCORERS:
+        scored, seconds = runs[name]
+        row = {"scorer": name, "pairs_per_sec": round(n / seconds, 1), **drift(golden, scored)}
+        results.append(row)
+        print(f"{name:<22} {row['pairs_per_sec']:>10} {row['score_diffs']:>12} "
+              f"{row['keyword_diffs']:>9} {row['max_score_diff']:>9}")
+
+    stages = stage_costs(golden)
+    total = sum(stages.values()) or 1.0
+    print(f"\nanalyze_content() stages, cold cache (ms/pair):")
+    for stage, ms in stages.items():
+        print(f"  {stage:<13} {ms:>8.3f}  {ms / total:>5.0%}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"pairs": n, "results": results, "stages_ms_per_pair": stages}, f, indent=2)
+        print(f"✅ Results written to {args.out}")
+
+    drifted = [r["scorer"] for r in results if r["score_diffs"] or r["keyword_diffs"]]
+    print(f"\nGolden set: {'drift in ' + ', '.join(drifted) if drifted else 'all scorers match'}")
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Benchmark: streaming DOCX extractor (docx_extractor.py) vs the previous
+ET.fromstring implementation that only read word/document.xml.
+
+The streaming extractor trades speed for memory: it reads more parts
+(headers, footers, notes) and iterparse is slower than one fromstring,
+so expect it to be ~1.2-2.3x slower while its parse-time peak memory is
+about 4x lower.
+
+Usage:
+    python bench_docx.py                 # default sizes
+    python bench_docx.py 200 2000 20000  # paragraph counts to test
+"""
+import io
+import sys
+import time
+import zipfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from docx_extractor import extract_docx
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+NS = (
+    f'xmlns:w="{W}" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def _para(text):
+    return f"<w:p><w:r><w:t xml:space=\"preserve\">{text}</w:t></w:r></w:p>"
+
+
+def make_docx(paragraphs=200, table_rows=20, header=True, footer=True, textbox=True):
+    """Builds a resume-like DOCX in memory (no python-docx needed)."""
+    body = []
+    if textbox:
+        box = _para("Portfolio: github.com/candidate")
+        body.append(
+            "<w:p><w:r><mc:AlternateContent>"
+            f"<mc:Choice Requires=\"wps\"><wps:txbx><w:txbxContent>{box}</w:txbxContent></wps:txbx></mc:Choice>"
+            f"<mc:Fallback><v:textbox><w:txbxContent>{box}</w:txbxContent></v:textbox></mc:Fallback>"
+            "</mc:AlternateContent></w:r></w:p>"
+        )
+    body.append(_para("Experience"))
+    for i in range(paragraphs):
+        body.append(_para(f"Developed and optimized service {i} using Python, Java and SQL for 10k users."))
+    body.append(_para("Skills"))
+    rows = "".join(
+        f"<w:tr><w:tc>{_para(f'Skill {r}')}</w:tc><w:tc>{_para('Advanced')}</w:tc></w:tr>"
+        for r in range(table_rows)
+    )
+    body.append(f"<w:tbl>{rows}</w:tbl>")
+    document = f"<?xml version=\"1.0\"?><w:document {NS}><w:body>{''.join(body)}</w:body></w:document>"
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", document)
+        if header:
+            zf.writestr("word/header1.xml", f"<w:hdr {NS}>{_para('Jane Doe | jane@example.com | +91 9876543210')}</w:hdr>")
+        if footer:
+            zf.writestr("word/footer1.xml", f"<w:ftr {NS}>{_para('linkedin.com/in/janedoe')}</w:ftr>")
+    return buf.getvalue()
+
+
+def legacy_extract_docx(file_bytes):
+    """The pre-streaming implementation from extract_text(), kept for comparison."""
+    with zipfile.ZipFile(io.BytesIO(file_bytes)) as docx:
+        tree = ET.fromstring(docx.read("word/document.xml"))
+        text_parts = []
+        for node in tree.iter():
+            if node.tag.endswith("}t"):
+                if node.text:
+                    text_parts.append(node.text)
+            elif node.tag.endswith("}p"):
+                text_parts.append("\n")
+            elif node.tag.endswith("}tr"):
+                text_parts.append("\n")
+        return "".join(text_parts).strip()
+
+
+def measure(fn, data, repeat=5):
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(data)
+        times.append(time.perf_counter() - start)
+    text = result["text"] if isinstance(result, dict) else result
+    return min(times) * 1000, peak / 1024 / 1024, len(text)
+
+
+def main(sizes):
+    print(f"{'paragraphs':>10} {'size KB':>8} | {'impl':<9} {'ms':>8} {'peak MB':>8} {'chars':>8}")
+    for n in sizes:
+        data = make_docx(paragraphs=n, table_rows=max(5, n // 10))
+        for name, fn in (("legacy", legacy_extract_docx), ("streaming", extract_docx)):
+            ms, peak, chars = measure(fn, data)
+            print(f"{n:>10} {len(data) // 1024:>8} | {name:<9} {ms:>8.1f} {peak:>8.2f} {chars:>8}")
+
+    sample = extract_docx(make_docx(paragraphs=3, table_rows=2))
+    legacy = legacy_extract_docx(make_docx(paragraphs=3, table_rows=2))
+    print("\nParts read:", sample["parts"])
+    print("Header/footer text recovered:", "jane@example.com" in sample["text"], "linkedin.com" in sample["text"])
+    print("Text box emitted once (streaming / legacy):",
+          sample["text"].count("github.com"), "/", legacy.count("github.com"))
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [200, 2000, 20000]
+    main(sizes)
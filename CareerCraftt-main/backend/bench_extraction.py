@@ -0,0 +1,309 @@
+"""
+Extraction benchmark: generates a local corpus of PDFs and DOCX files
+(varying size, column layout, tables and fonts) and runs every extractor
+path over it, reporting throughput, p50/p95 latency, peak RSS and
+extracted-char yield.
+
+Each path runs in its own subprocess so peak RSS is measured per path
+rather than accumulated across the run.
+
+Usage:
+    python bench_extraction.py                          # default corpus, 5 repeats
+    python bench_extraction.py --repeat 10 --out results.json
+    python bench_extraction.py --paths pdfminer pypdf   # subset of paths
+    python bench_extraction.py --compare old.json       # flag regressions vs a previous run
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import platform
+import tempfile
+import subprocess
+
+from bench_docx import make_docx
+
+PATHS = ("pdfminer", "pypdf", "auto", "docx")
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Java_Developer (1).pdf")
+# A path is flagged in --compare when p50 latency grows by more than this factor
+REGRESSION_FACTOR = 1.25
+
+FONTS = {"F1": "Helvetica", "F2": "Times-Roman", "F3": "Courier", "F4": "Helvetica-Bold"}
+SECTIONS = ["Experience", "Projects", "Education", "Skills", "Certifications"]
+BULLET = "Developed and optimized service {i} using Python, Java and SQL for 10k users."
+
+
+# ---------------------------------------------------------
+# CORPUS
+# ---------------------------------------------------------
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _show(font, size, x, y, text):
+    return f"BT /{font} {size} Tf {x} {y} Td ({_escape(text)}) Tj ET\n"
+
+
+def _page_stream(page_no, columns=1, table_rows=0, fonts=1):
+    """One resume-like page: heading, bullet lines in 1 or 2 columns, optional table."""
+    font_names = list(FONTS)[:max(1, fonts)]
+    out = [_show("F4" if fonts > 1 else "F1", 16, 50, 750, f"Jane Doe - Page {page_no + 1}")]
+    out.append(_show("F1", 10, 50, 734, "jane@example.com | +91 9876543210 | linkedin.com/in/janedoe"))
+
+    col_width = 520 // columns
+    y_top = 710
+    rows = 44 - table_rows
+    for col in range(columns):
+        x = 50 + col * col_width
+        y = y_top
+        for i in range(rows):
+            font = font_names[i % len(font_names)]
+            if i % 8 == 0:
+                out.append(_show("F4" if fonts > 1 else font, 12, x, y, SECTIONS[(i // 8) % len(SECTIONS)]))
+            else:
+                text = BULLET.format(i=page_no * 100 + col * 50 + i)
+                if columns > 1:
+                    text = text[:48]
+                out.append(_show(font, 9, x, y, text))
+            y -= 14
+
+    # Table: fixed-width cells laid out with absolute positions
+    y = y_top - rows * 14 - 10
+    for r in range(table_rows):
+        for c, x in enumerate((50, 200, 350, 480)):
+            out.append(_show(font_names[c % len(font_names)], 9, x, y, f"R{r}C{c} {'Advanced' if c % 2 else 'Skill'}"))
+        y -= 12
+    return "".join(out).encode("latin-1")
+
+
+def make_pdf(pages=1, columns=1, table_rows=0, fonts=1):
+    """Builds a small valid PDF with real text layers (no external tools needed)."""
+    font_dict = " ".join(
+        f"/{name} << /Type /Font /Subtype /Type1 /BaseFont /{base} >>" for name, base in FONTS.items()
+    )
+    resources = f"/Resources << /Font << {font_dict} >> >>".encode()
+
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(pages))
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    for i in range(pages):
+        stream = _page_stream(i, columns, table_rows, fonts)
+        objs.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] " + resources + f" /Contents {4 + 2 * i} 0 R >>".encode())
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{o:010d} 00000 n \n".encode() for o in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode()
+    return out
+
+
+def build_corpus(corpus_dir):
+    """Writes the corpus to corpus_dir and returns [{"name", "kind", "bytes", ...}]."""
+    specs = []
+    for pages in (1, 2, 5, 10, 25):
+        specs.append({"name": f"pdf_{pages}p_1col", "kind": "pdf", "pages": pages})
+    for pages in (1, 5):
+        specs.append({"name": f"pdf_{pages}p_2col", "kind": "pdf", "pages": pages, "columns": 2})
+        specs.append({"name": f"pdf_{pages}p_table", "kind": "pdf", "pages": pages, "table_rows": 12})
+        specs.append({"name": f"pdf_{pages}p_4fonts", "kind": "pdf", "pages": pages, "fonts": 4})
+    for paragraphs in (50, 500, 5000):
+        specs.append({"name": f"docx_{paragraphs}para", "kind": "docx", "paragraphs": paragraphs})
+    specs.append({"name": "docx_500para_table", "kind": "docx", "paragraphs": 500, "table_rows": 200})
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    corpus = []
+    for spec in specs:
+        if spec["kind"] == "pdf":
+            data = make_pdf(spec["pages"], spec.get("columns", 1), spec.get("table_rows", 0), spec.get("fonts", 1))
+        else:
+            data = make_docx(paragraphs=spec["paragraphs"], table_rows=spec.get("table_rows", 20))
+        path = os.path.join(corpus_dir, f"{spec['name']}.{spec['kind']}")
+        with open(path, "wb") as f:
+            f.write(data)
+        corpus.append({**spec, "path": path, "bytes": len(data)})
+
+    if os.path.exists(SAMPLE_PDF):
+        corpus.append({"name": "sample_java_developer", "kind": "pdf", "path": SAMPLE_PDF,
+                       "bytes": os.path.getsize(SAMPLE_PDF)})
+    return corpus
+
+
+# ---------------------------------------------------------
+# WORKER (one subprocess per extractor path)
+# ---------------------------------------------------------
+def _extractor(path_name):
+    from pdf_extractor import ExtractionBudget, extract_pdf, extract_pdfminer_pages, extract_pypdf_pages
+    from docx_extractor import extract_docx
+
+    # No page/char cap: measure the extractors themselves, not the budget
+    def budget():
+        return ExtractionBudget(max_pages=0, max_chars=0, deadline_seconds=600)
+
+    if path_name == "pdfminer":
+        return "pdf", lambda data: extract_pdfminer_pages(data, budget())
+    if path_name == "pypdf":
+        return "pdf", lambda data: extract_pypdf_pages(data, budget())
+    if path_name == "auto":
+        return "pdf", lambda data: extract_pdf(data, budget(), mode="auto")
+    if path_name == "docx":
+        return "docx", lambda data: extract_docx(data)
+    raise ValueError(f"Unknown extractor path: {path_name}")
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def run_path(path_name, corpus, repeat):
+    kind, fn = _extractor(path_name)
+    baseline_rss = _max_rss_mb()
+
+    files = []
+    all_latencies = []
+    total_bytes = 0
+    total_chars = 0
+    wall = 0.0
+    for item in corpus:
+        if item["kind"] != kind:
+            continue
+        with open(item["path"], "rb") as f:
+            data = f.read()
+        fn(data)  # warm-up (imports, font caches)
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn(data)
+            latencies.append((time.perf_counter() - start) * 1000)
+        chars = len(result["text"])
+        wall += sum(latencies) / 1000
+        total_bytes += item["bytes"] * repeat
+        total_chars += chars
+        all_latencies.extend(latencies)
+        files.append({
+            "name": item["name"],
+            "bytes": item["bytes"],
+            "chars": chars,
+            "chars_per_kb": round(chars / (item["bytes"] / 1024), 1),
+            "extractor": result.get("extractor", path_name),
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+        })
+
+    return {
+        "path": path_name,
+        "files": files,
+        "docs": len(files),
+        "docs_per_sec": round(len(all_latencies) / wall, 2) if wall else 0.0,
+        "mb_per_sec": round(total_bytes / (1024 * 1024) / wall, 2) if wall else 0.0,
+        "p50_ms": round(_percentile(all_latencies, 50), 2),
+        "p95_ms": round(_percentile(all_latencies, 95), 2),
+        "chars_total": total_chars,
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(_max_rss_mb(), 1),
+    }
+
+
+def _run_in_subprocess(path_name, corpus_file, repeat):
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", path_name,
+           "--corpus-file", corpus_file, "--repeat", str(repeat)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        print(f"❌ {path_name} failed:\n{proc.stderr[-2000:]}")
+        return {"path": path_name, "error": proc.stderr[-2000:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# ---------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------
+def compare(results, previous_file):
+    with open(previous_file, "r", encoding="utf-8") as f:
+        previous = {r["path"]: r for r in json.load(f)["results"] if "error" not in r}
+    regressions = []
+    for r in results:
+        old = previous.get(r["path"])
+        if not old or "error" in r or not old["p50_ms"]:
+            continue
+        ratio = r["p50_ms"] / old["p50_ms"]
+        if ratio > REGRESSION_FACTOR:
+            regressions.append(f"{r['path']}: p50 {old['p50_ms']} -> {r['p50_ms']} ms ({ratio:.2f}x)")
+        if r["chars_total"] < old["chars_total"]:
+            regressions.append(f"{r['path']}: char yield {old['chars_total']} -> {r['chars_total']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--corpus-dir", default=None, help="Where to write the generated corpus (default: temp dir)")
+    parser.add_argument("--out", default="bench_extraction_results.json")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to check for regressions")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--corpus-file", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.corpus_file, "r", encoding="utf-8") as f:
+            corpus = json.load(f)
+        print(json.dumps(run_path(args.worker, corpus, args.repeat)))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_extraction_") as tmp:
+        corpus = build_corpus(args.corpus_dir or os.path.join(tmp, "corpus"))
+        corpus_file = os.path.join(tmp, "corpus.json")
+        with open(corpus_file, "w", encoding="utf-8") as f:
+            json.dump(corpus, f)
+        print(f"📚 Corpus: {len(corpus)} files, {sum(c['bytes'] for c in corpus) // 1024} KB")
+
+        results = []
+        print(f"{'path':<9} {'docs':>5} {'docs/s':>8} {'MB/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'RSS MB':>7} {'chars':>9}")
+        for path_name in args.paths:
+            r = _run_in_subprocess(path_name, corpus_file, args.repeat)
+            results.append(r)
+            if "error" not in r:
+                print(f"{r['path']:<9} {r['docs']:>5} {r['docs_per_sec']:>8} {r['mb_per_sec']:>7} "
+                      f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['peak_rss_mb']:>7} {r['chars_total']:>9}")
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "corpus": [{k: v for k, v in c.items() if k != "path"} for c in corpus],
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.out}")
+
+    failed = any("error" in r for r in results)
+    if args.compare:
+        regressions = compare(results, args.compare)
+        for line in regressions:
+            print(f"⚠️ Regression: {line}")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
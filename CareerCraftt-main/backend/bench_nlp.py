@@ -0,0 +1,120 @@
+"""
+Benchmark: fast NLP mode (tokenizer + tagger + attribute ruler, JDs fed
+through nlp.pipe, resume tokenized once) vs the full en_core_web_sm
+pipeline run on the resume and the JD for every job, as /job-matches
+used to do.
+
+Checks that both produce identical resume tokens, JD keywords and scores.
+
+Usage:
+    python bench_nlp.py                # sample resume, 60 generated JDs
+    python bench_nlp.py 200            # number of JDs
+"""
+import os
+import sys
+import time
+
+import resume_analysis
+from resume_analysis import (
+    load_nlp, jd_keywords_from_doc, tfidf_similarity, hybrid_score, analyze_content_batch, extract_text,
+)
+from skill_taxonomy import skill_matcher
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Java_Developer (1).pdf")
+
+SKILLS = [
+    "Java", "Spring Boot", "Kubernetes", "AWS", "Python", "Django", "React", "TypeScript", "SQL",
+    "PostgreSQL", "Docker", "Microservices", "REST APIs", "Kafka", "Redis", "Node.js", "GraphQL",
+    "Terraform", "CI/CD pipelines", "Machine Learning", "Pandas", "Azure", "Linux", "Git",
+]
+ROLES = ["Backend Developer", "Full Stack Engineer", "Data Analyst", "DevOps Engineer", "Java Developer"]
+
+
+def make_jds(n):
+    jds = []
+    for i in range(n):
+        picked = [SKILLS[(i * 7 + k * 5) % len(SKILLS)] for k in range(6)]
+        jds.append(
+            f"We are hiring a {ROLES[i % len(ROLES)]} to design and build scalable services. "
+            f"Required: {', '.join(picked[:4])}. Nice to have: {', '.join(picked[4:])}. "
+            f"The candidate will collaborate with product teams, write clean code and own deployments."
+        )
+    return jds
+
+
+def sample_resume():
+    if os.path.exists(SAMPLE_PDF):
+        with open(SAMPLE_PDF, "rb") as f:
+            text = extract_text(f.read(), "sample.pdf")
+        if text:
+            return text
+    return (
+        "Jane Doe\njane@example.com\nExperience\nDeveloped Java Spring Boot microservices on AWS. "
+        "Built React dashboards with TypeScript. Automated Docker deployments with CI/CD pipelines.\n"
+        "Skills\nJava, Python, SQL, PostgreSQL, Kafka, Redis, Git, Linux\n"
+    )
+
+
+def full_pipeline_scores(nlp, resume_text, jds):
+    """The previous analyze_content() loop: full pipeline on both texts, for every job."""
+    results, keywords = [], []
+    for jd in jds:
+        resume_doc = nlp(resume_text.lower())
+        jd_doc = nlp(jd)
+        tokens = {t.text.lower() for t in resume_doc if not t.is_stop and not t.is_punct}
+        tokens |= skill_matcher.values(resume_text)
+        kws = jd_keywords_from_doc(jd_doc)
+        keywords.append(kws)
+        results.append(hybrid_score(tfidf_similarity(resume_text, jd), tokens, kws))
+    return results, keywords, tokens
+
+
+def fast_scores(nlp, resume_text, jds):
+    resume_analysis.nlp = nlp
+    results = analyze_content_batch(resume_text, jds)
+    keywords = [jd_keywords_from_doc(doc) for doc in nlp.pipe(jds)]
+    return results, keywords, resume_analysis.resume_tokens(resume_text)
+
+
+def timed(fn, *args):
+    cpu, wall = time.process_time(), time.perf_counter()
+    out = fn(*args)
+    return out, (time.process_time() - cpu) * 1000, (time.perf_counter() - wall) * 1000
+
+
+def main(n):
+    resume_text = sample_resume()
+    jds = make_jds(n)
+    full_nlp = load_nlp("full")
+    fast_nlp = load_nlp("fast")
+    print(f"full pipeline: {full_nlp.pipe_names}")
+    print(f"fast pipeline: {fast_nlp.pipe_names}")
+    # Without them both runs are the same tokenizer-only pipeline and the comparison proves nothing
+    missing = [name for name in ("tagger", "parser") if name not in full_nlp.pipe_names]
+    if missing:
+        print(f"❌ Full pipeline has no {', '.join(missing)}; install the full en_core_web_sm to run this benchmark")
+        return 2
+
+    # Warm-up both (vector tables, first-call allocations)
+    full_pipeline_scores(full_nlp, resume_text, jds[:2])
+    fast_scores(fast_nlp, resume_text, jds[:2])
+
+    (full_results, full_kws, full_tokens), full_cpu, full_wall = timed(full_pipeline_scores, full_nlp, resume_text, jds)
+    (fast_results, fast_kws, fast_tokens), fast_cpu, fast_wall = timed(fast_scores, fast_nlp, resume_text, jds)
+
+    print(f"\n{'mode':<6} {'JDs':>5} {'CPU ms':>9} {'wall ms':>9} {'ms/JD':>7}")
+    print(f"{'full':<6} {n:>5} {full_cpu:>9.1f} {full_wall:>9.1f} {full_wall / n:>7.2f}")
+    print(f"{'fast':<6} {n:>5} {fast_cpu:>9.1f} {fast_wall:>9.1f} {fast_wall / n:>7.2f}")
+    print(f"CPU time: {fast_cpu / full_cpu:.0%} of the full pipeline" if full_cpu else "")
+
+    same_tokens = full_tokens == fast_tokens
+    same_keywords = full_kws == fast_kws
+    same_scores = full_results == fast_results
+    print(f"\nResume tokens identical: {same_tokens}")
+    print(f"JD keywords identical:   {same_keywords}")
+    print(f"Scores identical:        {same_scores}")
+    return 0 if same_tokens and same_keywords and same_scores else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 60))
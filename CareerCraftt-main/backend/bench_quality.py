@@ -0,0 +1,156 @@
+"""
+Micro-benchmark: analyze_quality() with the single-pass rule engine
+(quality_rules.py) vs the previous implementation, which ran one re.search
+per verb (patterns built per call) and a substring scan per section keyword.
+
+Both are fed the same resumes and the same segment_resume() output, so only
+the checks themselves are timed. Checks that both produce identical
+suggestions, including for rule text inside an email domain.
+
+Usage:
+    python bench_quality.py                # sample resume + 200 generated variants
+    python bench_quality.py 1000           # number of generated resumes
+"""
+import re
+import sys
+import time
+import random
+
+from resume_analysis import analyze_quality
+from resume_sections import segment_resume, section_text, section_types
+from bench_nlp import sample_resume, SKILLS
+
+VERBS = [
+    "led", "developed", "created", "managed", "designed", "worked", "helped", "made", "used", "built",
+    "optimized", "mentored", "was responsible for", "engineered", "supported",
+]
+HEADINGS = ["Experience", "Education", "Skills", "Projects", "Certifications"]
+
+
+def legacy_analyze_quality(resume_text, sections):
+    """analyze_quality() before the rule engine, kept verbatim for comparison."""
+    suggestions = []
+    text_lower = resume_text.lower()
+    contact = section_text(resume_text, sections, {"contact"})
+
+    def found(check):
+        return check(contact) or (contact != resume_text and check(resume_text))
+
+    if not found(lambda t: re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', t)):
+        suggestions.append("⚠️ Missing Email Address")
+    if not found(lambda t: re.search(r'\b\d{10,}\b', t) or re.search(r'\+\d{1,3}[-.\s]?\d{10}', t)):
+        suggestions.append("⚠️ Missing Phone Number")
+    if not found(lambda t: "linkedin.com" in t.lower()):
+        suggestions.append("💡 Add your LinkedIn Profile URL")
+
+    required_sections = ["experience", "education", "skills", "projects"]
+    legacy_keywords = {
+        "experience": ["experience", "employment", "work history"],
+        "education": ["education", "academic", "qualification"],
+        "skills": ["skills", "technologies", "competencies"],
+        "projects": ["projects", "personal projects"]
+    }
+    present = section_types(sections)
+    for section in required_sections:
+        if section in present:
+            continue
+        if any(kw in text_lower for kw in legacy_keywords[section]):
+            continue
+        suggestions.append(f"🚫 Missing '{section.capitalize()}' section")
+
+    word_count = len(resume_text.split())
+    if word_count < 200:
+        suggestions.append("⚠️ Resume is too short (< 200 words). Add more detail.")
+    elif word_count > 1500:
+        suggestions.append("⚠️ Resume might be too long (> 2 pages). Keep it concise.")
+
+    strong_verbs = [
+        "led", "developed", "created", "managed", "designed", "architected", "implemented", "optimized", "achieved",
+        "spearheaded", "orchestrated", "engineered", "facilitated", "mentored"
+    ]
+    weak_verbs = {
+        "worked": ["Collaborated", "Contributed", "Engineered"],
+        "helped": ["Assisted", "Facilitated", "Supported"],
+        "made": ["Built", "Constructed", "Developed"],
+        "used": ["Utilized", "Leveraged", "Deployed"],
+        "responsible": ["Accountable for", "Led", "Oversaw"]
+    }
+    verb_count = 0
+    for verb in strong_verbs:
+        if re.search(rf'\b{verb}\b', text_lower):
+            verb_count += 1
+    if verb_count < 3:
+        suggestions.append(f"💡 Use more action verbs like 'Managed' or 'Created' (Found only {verb_count})")
+    for weak, strong_opts in weak_verbs.items():
+        if re.search(rf'\b{weak}\b', text_lower):
+            suggestions.append(f"⚠️ Smart Tip: Swap '{weak}' with stronger words like '{strong_opts[0]}' or '{strong_opts[1]}'")
+    return suggestions
+
+
+# Rule text inside another rule's match (a domain of an email address), which the
+# baseline's separate checks find
+OVERLAP_RESUMES = [
+    "Jane Doe\njane@skills.dev\nBuilt services for 4 teams.",
+    "John Roe\nme@experience.io +91 9876543210\nEducation\nB.Tech",
+    "reach me at jane.doe@linkedin.com\nProjects\nDeveloped a compiler.",
+    "a@developed.io b@worked.com c@projects.education.org linkedin.com/in/x",
+]
+
+
+def make_resumes(n, seed=7):
+    """Resumes with a random mix of contact details, headings, verbs and lengths."""
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(n):
+        lines = [f"Candidate {i}"]
+        if rng.random() < 0.8:
+            lines.append(f"candidate{i}@example.com")
+        if rng.random() < 0.7:
+            lines.append(f"+91 {rng.randrange(10 ** 9, 10 ** 10)}")
+        if rng.random() < 0.5:
+            lines.append(f"linkedin.com/in/candidate{i}")
+        use_headings = rng.random() < 0.7
+        for heading in rng.sample(HEADINGS, rng.randint(1, len(HEADINGS))):
+            lines.append(heading if use_headings else f"My {heading.lower()} include the following.")
+            for _ in range(rng.randint(1, 12)):
+                lines.append(
+                    f"{rng.choice(VERBS).capitalize()} {rng.choice(SKILLS)} services with "
+                    f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 40)} teams."
+                )
+        resumes.append("\n".join(lines))
+    return resumes
+
+
+def timed(fn, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = [fn(text, sections) for text, sections in inputs]
+    return out, (time.perf_counter() - start) / (repeat * len(inputs)) * 1e6
+
+
+def main(n):
+    resumes = [sample_resume()] + OVERLAP_RESUMES + make_resumes(n)
+    inputs = [(text, segment_resume(text)) for text in resumes]
+    repeat = 5
+
+    legacy_analyze_quality(*inputs[0])
+    analyze_quality(*inputs[0])
+    legacy, legacy_us = timed(legacy_analyze_quality, inputs, repeat)
+    engine, engine_us = timed(analyze_quality, inputs, repeat)
+
+    words = sum(len(text.split()) for text in resumes) / len(resumes)
+    print(f"{len(resumes)} resumes, {words:.0f} words on average, averaged over {repeat} runs")
+    print(f"\n{'implementation':<16} {'us/resume':>10}")
+    print(f"{'legacy':<16} {legacy_us:>10.1f}")
+    print(f"{'rule engine':<16} {engine_us:>10.1f}")
+    print(f"Speedup: {legacy_us / engine_us:.1f}x" if engine_us else "")
+
+    diffs = [i for i, (a, b) in enumerate(zip(legacy, engine)) if a != b]
+    print(f"\nSuggestions identical: {not diffs}")
+    for i in diffs[:5]:
+        print(f"  resume {i}:\n    legacy: {legacy[i]}\n    engine: {engine[i]}")
+    return 0 if not diffs else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,123 @@
+import os
+import io
+import csv
+import json
+import zipfile
+import logging
+
+from upload_ingest import ingest_stream, UploadRejected, MAX_UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Limits for /admin/bulk-analyze
+BULK_MAX_UPLOAD_BYTES = int(float(os.getenv("BULK_MAX_UPLOAD_MB", "200")) * 1024 * 1024)
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "1000"))
+# Resumes in flight at once; kept below the pipeline queue limit so
+# interactive /analyze-resume requests still get a slot
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "4"))
+# Reject archive members that inflate suspiciously (zip bombs)
+MAX_COMPRESSION_RATIO = 100
+
+CSV_FIELDS = ["file", "status", "ats_score", "missing_keywords", "suggestions", "error"]
+
+
+def _is_archive(upload):
+    name = (upload.filename or "").lower()
+    if name.endswith(".zip"):
+        return True
+    if name.endswith(".docx"):
+        return False
+    # A zip without word/document.xml is an archive of resumes, not a DOCX
+    upload.file.seek(0)
+    head = upload.file.read(4)
+    upload.file.seek(0)
+    if head != b"PK\x03\x04":
+        return False
+    try:
+        with zipfile.ZipFile(upload.file) as zf:
+            return "word/document.xml" not in zf.namelist()
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        upload.file.seek(0)
+
+
+def _iter_archive(upload):
+    try:
+        zf = zipfile.ZipFile(upload.file)
+    except zipfile.BadZipFile:
+        yield upload.filename, UploadRejected(415, "Corrupt ZIP archive.")
+        return
+
+    with zf:
+        for info in zf.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                continue
+            if info.file_size > MAX_UPLOAD_BYTES:
+                yield name, UploadRejected(413, "File too large.")
+                continue
+            if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+                yield name, UploadRejected(413, "Suspicious compression ratio.")
+                continue
+            try:
+                # Members are streamed into their own spool, one at a time
+                with zf.open(info) as member:
+                    yield name, ingest_stream(member, os.path.basename(name))
+            except UploadRejected as e:
+                yield name, e
+            except (zipfile.BadZipFile, OSError, RuntimeError) as e:
+                yield name, UploadRejected(415, f"Could not read archive member: {e}")
+
+
+def iter_bulk_sources(files):
+    """
+    Yields (name, IngestedUpload | UploadRejected) for every resume in the
+    request: plain PDF/DOCX uploads and the members of any ZIP archives.
+    Lazy and sequential, so at most one unprocessed resume is spooled per call.
+    Caps the total at BULK_MAX_FILES.
+    """
+    count = 0
+    for upload in files:
+        if _is_archive(upload):
+            sources = _iter_archive(upload)
+        else:
+            upload.file.seek(0)
+            sources = [(upload.filename, None)]
+
+        for name, item in sources:
+            if count >= BULK_MAX_FILES:
+                if not isinstance(item, UploadRejected) and item is not None:
+                    item.close()
+                yield name, UploadRejected(413, f"Batch limit of {BULK_MAX_FILES} resumes reached.")
+                return
+            count += 1
+            if item is None:
+                try:
+                    item = ingest_stream(upload.file, upload.filename)
+                except UploadRejected as e:
+                    item = e
+            yield name, item
+
+
+def to_ndjson(record):
+    return json.dumps(record) + "\n"
+
+
+def csv_header():
+    buf = io.StringIO()
+    csv.writer(buf).writerow(CSV_FIELDS)
+    return buf.getvalue()
+
+
+def to_csv(record):
+    buf = io.StringIO()
+    csv.writer(buf).writerow([
+        record.get("file", ""),
+        record.get("status", ""),
+        record.get("ats_score", ""),
+        "; ".join(record.get("missing_keywords", [])),
+        " | ".join(record.get("suggestions", [])),
+        record.get("error", ""),
+    ])
+    return buf.getvalue()
@@ -0,0 +1,203 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU map with hit/miss counters.
+    Bounded by entry count and (optionally) by a total weight such as text length.
+    """
+
+    def __init__(self, max_entries=256, max_weight=None, weigher=None):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.weigher = weigher or (lambda value: 1)
+        self._data = OrderedDict()
+        self._weights = {}
+        self._total_weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        weight = self.weigher(value)
+        with self._lock:
+            if key in self._data:
+                self._total_weight -= self._weights.pop(key)
+                del self._data[key]
+            # A single value larger than the whole budget is never cached
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+            self._data[key] = value
+            self._weights[key] = weight
+            self._total_weight += weight
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._total_weight -= self._weights.pop(key)
+            return self._data.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._weights.clear()
+            self._total_weight = 0
+
+    def _evict(self):
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_weight is not None and self._total_weight > self.max_weight)
+        ):
+            old_key, _ = self._data.popitem(last=False)
+            self._total_weight -= self._weights.pop(old_key)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "weight": self._total_weight,
+            "max_weight": self.max_weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class ExtractionCache:
+    """
+    Content-addressed cache for extracted resume text and its section
+    segmentation (entries are {"text", "sections"}).
+    Key = SHA-256 of the upload bytes + file extension + extractor version, so the
+    same PDF sent to /analyze-resume and /analyze-resume-ai is only parsed once.
+    Memory tier is an LRU; the optional disk tier (EXTRACTION_CACHE_DIR) survives restarts.
+    """
+
+    def __init__(self, max_entries=128, max_chars=8_000_000, disk_dir=None, disk_max_files=2000):
+        self.memory = LRUCache(max_entries=max_entries, max_weight=max_chars, weigher=lambda entry: len(entry["text"]))
+        self.disk_dir = disk_dir
+        self.disk_max_files = disk_max_files
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self._disk_lock = threading.Lock()
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Extraction cache disk tier disabled: {e}")
+                self.disk_dir = None
+
+    @staticmethod
+    def make_key(sha256_hex, filename, version):
+        """sha256_hex: hex digest of the upload bytes (computed while ingesting)."""
+        ext = os.path.splitext(filename or "")[1].lower()
+        return f"{sha256_hex}{ext}.v{version}"
+
+    @staticmethod
+    def hash_bytes(file_bytes):
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    def get(self, key):
+        """Returns the cached {"text", "sections"} entry or None."""
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+        entry = self._disk_get(key)
+        if entry is not None:
+            self.disk_hits += 1
+            self.memory.put(key, entry)
+        return entry
+
+    def put(self, key, text, sections=None):
+        if text is None:
+            return
+        entry = {"text": text, "sections": sections or []}
+        self.memory.put(key, entry)
+        self._disk_put(key, entry)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if "text" not in entry:
+                return None
+            entry.setdefault("sections", [])
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Extraction cache: unreadable entry {path}: {e}")
+            return None
+
+    def _disk_put(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with self._disk_lock:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+                self.disk_writes += 1
+                self._prune_disk()
+        except OSError as e:
+            logger.warning(f"Extraction cache: failed to write {path}: {e}")
+
+    def _prune_disk(self):
+        entries = [e for e in os.scandir(self.disk_dir) if e.name.endswith(".json")]
+        if len(entries) <= self.disk_max_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - self.disk_max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats["disk_enabled"] = bool(self.disk_dir)
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_writes"] = self.disk_writes
+        return stats
+
+
+extraction_cache = ExtractionCache(
+    max_entries=int(os.getenv("EXTRACTION_CACHE_ENTRIES", "128")),
+    max_chars=int(os.getenv("EXTRACTION_CACHE_MAX_CHARS", "8000000")),
+    disk_dir=os.getenv("EXTRACTION_CACHE_DIR") or None,
+)
@@ -0,0 +1,131 @@
+import io
+import re
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+TEXT_TAGS = {W_NS + "t", A_NS + "t"}
+NEWLINE_TAGS = {W_NS + "p", W_NS + "tr", A_NS + "p"}  # newline at the start of each paragraph / table row
+BREAK_TAGS = {W_NS + "br", W_NS + "cr"}
+W_TAB = W_NS + "tab"
+W_TABS = W_NS + "tabs"
+
+# Text-bearing parts, in reading order. Headers come first because many
+# resume templates keep name/email/phone there.
+PART_PATTERNS = [
+    re.compile(r"^word/header\d*\.xml$"),
+    re.compile(r"^word/document\.xml$"),
+    re.compile(r"^word/footnotes\.xml$"),
+    re.compile(r"^word/endnotes\.xml$"),
+    re.compile(r"^word/footer\d*\.xml$"),
+]
+
+# Guard against zip bombs: skip any single part that inflates beyond this
+MAX_PART_BYTES = 50 * 1024 * 1024
+
+
+def _natural_key(name):
+    return [int(tok) if tok.isdigit() else tok for tok in re.split(r"(\d+)", name)]
+
+
+def list_text_parts(zf):
+    names = zf.namelist()
+    parts = []
+    for pattern in PART_PATTERNS:
+        parts.extend(sorted((n for n in names if pattern.match(n)), key=_natural_key))
+    return parts
+
+
+def iter_part_text(stream):
+    """
+    Streams one WordprocessingML part with iterparse and yields text pieces.
+    Elements are cleared as soon as they end so memory stays flat regardless of
+    document size. Text boxes are read from their mc:Choice branch only; the
+    mc:Fallback (VML) copy is skipped so the same text is not emitted twice.
+    """
+    stack = []
+    skip_depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if skip_depth or tag == MC_FALLBACK:
+                skip_depth += 1
+            elif tag in NEWLINE_TAGS:
+                yield "\n"
+            continue
+
+        stack.pop()
+        if skip_depth:
+            skip_depth -= 1
+        elif tag in TEXT_TAGS:
+            if elem.text:
+                yield elem.text
+        elif tag == W_TAB and stack[-1].tag != W_TABS:
+            # w:tab inside a run is a tab character; inside w:tabs it is a tab-stop definition
+            yield "\t"
+        elif tag in BREAK_TAGS:
+            yield "\n"
+
+        # Paragraphs/tables are fully handled once they end: drop them from the
+        # in-memory tree. Clearing at block level keeps per-event overhead low.
+        if len(stack) <= 2 or tag in NEWLINE_TAGS:
+            elem.clear()
+            if stack:
+                stack[-1].clear()
+
+
+def extract_docx(source, max_chars=None):
+    """
+    Streaming DOCX extraction over every text-bearing part (headers, body,
+    tables, text boxes, foot/endnotes, footers).
+    source: bytes or a seekable binary file object / mmap.
+    Returns {"text", "parts", "truncated", "truncated_reason"}.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    pieces = []
+    chars = 0
+    seen_parts = set()
+    parts_read = []
+    reason = None
+
+    with zipfile.ZipFile(source) as zf:
+        for name in list_text_parts(zf):
+            info = zf.getinfo(name)
+            if info.file_size > MAX_PART_BYTES:
+                logger.warning(f"DOCX part {name} skipped ({info.file_size} bytes uncompressed)")
+                continue
+
+            part_pieces = []
+            part_chars = 0
+            with zf.open(info) as stream:
+                for piece in iter_part_text(stream):
+                    part_pieces.append(piece)
+                    part_chars += len(piece)
+                    if max_chars and chars + part_chars >= max_chars:
+                        reason = "chars"
+                        break
+
+            part_text = "".join(part_pieces).strip()
+            # First-page/even-page headers often repeat the default header verbatim
+            if part_text and part_text not in seen_parts:
+                seen_parts.add(part_text)
+                parts_read.append(name)
+                pieces.append(part_text)
+                chars += len(part_text) + 1
+            if reason:
+                break
+
+    text = "\n".join(pieces)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+        reason = reason or "chars"
+    return {"text": text, "parts": parts_read, "truncated": reason is not None, "truncated_reason": reason}
@@ -0,0 +1,135 @@
+import os
+import logging
+import threading
+from collections import Counter, deque
+
+logger = logging.getLogger(__name__)
+
+# Recent durations kept per (kind, extractor) for p50/p95
+LATENCY_SAMPLES = int(os.getenv("EXTRACTION_METRICS_SAMPLES", "500"))
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return round(ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo), 2)
+
+
+class _PathStats:
+    """Totals for one (file kind, extractor) pair."""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes_in = 0
+        self.chars_out = 0
+        self.pages = 0
+        self.duration_ms = 0.0
+        self.wall_ms = 0.0
+        self.empty = 0
+        self.truncated = Counter()
+        self.fallback_reasons = Counter()
+        self.stage_ms = Counter()
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+
+    def as_dict(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "bytes_in": self.bytes_in,
+            "chars_out": self.chars_out,
+            "pages": self.pages,
+            "empty": self.empty,
+            "avg_ms": round(self.duration_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            # Including pool queueing and IPC
+            "avg_wall_ms": round(self.wall_ms / self.count, 2) if self.count else 0.0,
+            "chars_per_kb": round(self.chars_out / (self.bytes_in / 1024), 1) if self.bytes_in else 0.0,
+            "truncated": dict(self.truncated),
+            "fallback_reasons": dict(self.fallback_reasons),
+            "stage_ms_total": {k: round(v, 2) for k, v in self.stage_ms.items()},
+        }
+
+
+class ExtractionMetrics:
+    """
+    In-process aggregate of resume extraction outcomes, keyed by file kind
+    and the extractor that produced the text (pypdf / pdfminer / docx / none).
+    Fed from the extract_resume() report in the API process (extraction itself
+    runs in the resume_pipeline workers), so counts survive worker restarts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = {}
+        self.cache_hits = Counter()
+        self.vision_ocr = Counter()
+        self.failures = Counter()
+
+    def record(self, kind, report, bytes_in, wall_ms):
+        """
+        report: the extract_resume() report; its "duration_ms" is the worker-side
+        extraction time. wall_ms is what the request waited, queueing included.
+        """
+        extractor = report.get("extractor") or "none"
+        duration_ms = report.get("duration_ms", wall_ms)
+        with self._lock:
+            stats = self._paths.setdefault((kind, extractor), _PathStats())
+            stats.count += 1
+            stats.bytes_in += bytes_in or 0
+            stats.chars_out += len(report.get("text") or "")
+            stats.pages += report.get("pages_read") or 0
+            stats.duration_ms += duration_ms
+            stats.wall_ms += wall_ms
+            stats.samples.append(duration_ms)
+            if not report.get("text"):
+                stats.empty += 1
+            if report.get("truncated"):
+                stats.truncated[report.get("truncated_reason") or "unknown"] += 1
+            if report.get("fallback_reason"):
+                stats.fallback_reasons[report["fallback_reason"]] += 1
+            for stage, ms in (report.get("timings_ms") or {}).items():
+                stats.stage_ms[stage] += ms
+        logger.debug(
+            f"Extracted {len(report.get('text') or '')} chars from {kind} via {extractor} "
+            f"({bytes_in} bytes, {report.get('pages_read', 0)} pages, {duration_ms:.1f} ms, "
+            f"fallback={report.get('fallback_reason')})"
+        )
+
+    def record_cache_hit(self, kind):
+        with self._lock:
+            self.cache_hits[kind] += 1
+
+    def record_failure(self, kind, reason):
+        with self._lock:
+            self.failures[f"{kind}:{reason}"] += 1
+
+    def record_vision_ocr(self, kind):
+        """An upload whose text layer was too thin and was sent to the LLM as a raw file."""
+        with self._lock:
+            self.vision_ocr[kind] += 1
+
+    def stats(self):
+        with self._lock:
+            by_kind = {}
+            for (kind, extractor), path in sorted(self._paths.items()):
+                by_kind.setdefault(kind, {})[extractor] = path.as_dict()
+            totals = {
+                kind: {
+                    "count": sum(p["count"] for p in extractors.values()),
+                    "empty": sum(p["empty"] for p in extractors.values()),
+                }
+                for kind, extractors in by_kind.items()
+            }
+            return {
+                "by_kind": by_kind,
+                "totals": totals,
+                "cache_hits": dict(self.cache_hits),
+                "vision_ocr": dict(self.vision_ocr),
+                "failures": dict(self.failures),
+            }
+
+
+extraction_metrics = ExtractionMetrics()
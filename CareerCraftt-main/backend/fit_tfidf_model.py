@@ -0,0 +1,76 @@
+"""
+Offline job: fit the corpus TF-IDF model (tfidf_model.py) on every job and
+placement in Firestore and write it to TFIDF_MODEL_DIR.
+
+Run it once to enable corpus idf scoring, then from cron (or let the API
+refit in the background, see TfidfModelStore.enable_auto_refit):
+
+    python fit_tfidf_model.py                    # fit and write the model
+    python fit_tfidf_model.py --if-stale         # only when older than TFIDF_MODEL_MAX_AGE_HOURS
+    python fit_tfidf_model.py --out /data/models --min-df 2
+"""
+import os
+import sys
+import time
+import argparse
+
+from tfidf_model import fit_model, CorpusTfidfModel, TFIDF_MODEL_DIR, TFIDF_MODEL_MAX_AGE_HOURS
+
+JOB_FIELDS = ("role", "skills", "description")
+PLACEMENT_FIELDS = ("company", "domains", "roles", "eligibility")
+
+
+def _doc_text(data, fields):
+    parts = []
+    for field in fields:
+        value = data.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(v) for v in value)
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+def load_corpus(db):
+    """One document per job (jobs collection) and per placement drive (placements/{college}.companies)."""
+    if db is None:
+        raise RuntimeError("Firestore is not initialized")
+    documents = []
+    for doc in db.collection("jobs").stream():
+        documents.append(_doc_text(doc.to_dict(), JOB_FIELDS))
+    for doc in db.collection("placements").stream():
+        for company in doc.to_dict().get("companies", []):
+            documents.append(_doc_text(company, PLACEMENT_FIELDS))
+    return [d for d in documents if d.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=TFIDF_MODEL_DIR, help="Model directory (default: TFIDF_MODEL_DIR)")
+    parser.add_argument("--min-df", type=int, default=1, help="Ignore terms in fewer documents than this")
+    parser.add_argument("--if-stale", action="store_true", help="Skip when the current model is fresh enough")
+    args = parser.parse_args()
+
+    if args.if_stale:
+        try:
+            current = CorpusTfidfModel.load(args.out)
+            age_hours = (time.time() - current.meta["fitted_at"]) / 3600
+            if age_hours < TFIDF_MODEL_MAX_AGE_HOURS:
+                print(f"✅ Model is {age_hours:.1f}h old, nothing to do")
+                return 0
+        except (OSError, ValueError):
+            pass
+
+    from firebase_config import firebase_client
+    try:
+        documents = load_corpus(firebase_client.db)
+        meta = fit_model(documents, args.out, min_df=args.min_df)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ Fitted on {meta['n_docs']} documents, {meta['n_terms']} terms -> {os.path.abspath(args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+import os
+import time
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Upstream job feeds (RemoteOK) for /job-matches, which used to download the
+# whole feed once per extracted role for every request.
+#
+# FeedIngester pulls each feed on a background thread every FEED_TTL_SECONDS
+# (FeedCache: one shared session, revalidated with ETag / If-Modified-Since),
+# normalizes each item once (dates parsed, job card built) and publishes a
+# FeedIndex: an inverted index from title words / tags to items.
+# /job-matches only reads the current FeedIndex and never touches the network;
+# when a refresh fails the last index keeps being served.
+
+logger = logging.getLogger(__name__)
+
+REMOTEOK_URL = "https://remoteok.com/api"
+FEED_TTL_SECONDS = float(os.getenv("FEED_TTL_SECONDS", "600"))
+FEED_TIMEOUT_SECONDS = 5
+# After a failed refresh, wait this long before trying again
+FEED_RETRY_SECONDS = 60
+# /job-matches: per-role source calls run on this many threads, all under one deadline
+JOB_SOURCE_WORKERS = int(os.getenv("JOB_SOURCE_WORKERS", "8"))
+JOB_SOURCE_DEADLINE_SECONDS = float(os.getenv("JOB_SOURCE_DEADLINE_SECONDS", "4"))
+
+
+def _make_session():
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+    session.mount("https://", HTTPAdapter(max_retries=retries))
+    session.headers["User-Agent"] = "CareerCraft/1.0"
+    return session
+
+
+class FeedCache:
+    """
+    One upstream JSON feed: the last payload plus its validators, so
+    refresh() only downloads the feed when it changed.
+    parse: turns the response JSON into the cached payload.
+    """
+
+    def __init__(self, url, ttl=FEED_TTL_SECONDS, parse=None, name=None):
+        self.url = url
+        self.ttl = ttl
+        self.parse = parse or (lambda data: data)
+        self.name = name or url
+        self._session = None
+        self._data = None
+        self._etag = None
+        self._last_modified = None
+        self._fetched_at = None      # monotonic time of the last 200 / 304
+        self.last_error = None
+        self.counters = {"refreshes": 0, "not_modified": 0, "failures": 0}
+
+    def refresh(self):
+        """Conditional GET; returns the payload (the previous one on 304 or failure, None if never fetched)."""
+        try:
+            if self._session is None:
+                self._session = _make_session()
+            headers = {}
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+            resp = self._session.get(self.url, headers=headers, timeout=FEED_TIMEOUT_SECONDS)
+            if resp.status_code == 304 and self._data is not None:
+                self.counters["not_modified"] += 1
+            elif resp.status_code == 200:
+                self._data = self.parse(resp.json())
+                self._etag = resp.headers.get("ETag")
+                self._last_modified = resp.headers.get("Last-Modified")
+                self.counters["refreshes"] += 1
+                logger.info(f"Feed {self.name} refreshed")
+            else:
+                raise requests.HTTPError(f"HTTP {resp.status_code}")
+            self._fetched_at = time.monotonic()
+            self.last_error = None
+        except Exception as e:
+            # Keep the last payload; the ingester retries after FEED_RETRY_SECONDS
+            self.counters["failures"] += 1
+            self.last_error = str(e)
+            print(f"⚠️ Feed {self.name} refresh failed: {e}")
+        return self._data
+
+    def stats(self):
+        age = None if self._fetched_at is None else time.monotonic() - self._fetched_at
+        return {
+            **self.counters,
+            "cached": self._data is not None,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "ttl_seconds": self.ttl,
+            "last_error": self.last_error,
+        }
+
+
+# RemoteOK's first element is a legal notice, not a job
+remoteok_feed = FeedCache(REMOTEOK_URL, parse=lambda data: data[1:] if len(data) > 1 else [], name="remoteok")
+
+
+# --- ingestion + inverted index ---
+def parse_posted_at(value):
+    """Naive datetime of a feed date, None when missing; raises ValueError when unparseable."""
+    if not value:
+        return None
+    posted = datetime.datetime.fromisoformat(value)
+    # Convert to naive to compare with datetime.now()
+    return posted.replace(tzinfo=None) if posted.tzinfo is not None else posted
+
+
+def remoteok_item(j):
+    """A RemoteOK job as a feed item: match fields plus the /job-matches card."""
+    desc_clean = (j.get("description") or "")[:500] + "..."
+    return {
+        "title": (j.get("position") or "").lower(),
+        "tags": [str(t).lower() for t in j.get("tags") or []],
+        "date": j.get("date"),
+        "card": {
+            "role": j.get("position"),
+            "company": j.get("company"),
+            "skills": ", ".join((j.get("tags") or [])[:4]),
+            "location": j.get("location", "Remote"),
+            "salary": j.get("salary", "Not Disclosed"),
+            "url": j.get("url"),
+            "posted_at": j.get("date"),
+            "source": "RemoteOK (Live)",
+            "description": f"**Real-Time Listing**\n\n{desc_clean}\n\n👉 **Apply Directly**: [Click Here]({j.get('url')})"
+        },
+    }
+
+
+class FeedIndex:
+    """
+    Immutable index over normalized feed items. search(keyword) returns the
+    items whose title or a tag contains keyword (a substring match, as the
+    per-request scan did) in feed order.
+    Keys are title words and whole tags; every word of the keyword must be
+    a substring of some key of an item, so candidates are found from the
+    (small) vocabulary and only they are checked against the keyword.
+    """
+
+    def __init__(self, items, generation=0):
+        self.generation = generation
+        self.items = []
+        self.posted_at = []
+        postings = {}
+        for item in items:
+            try:
+                posted = parse_posted_at(item.get("date"))
+            except (TypeError, ValueError):
+                continue  # Skip if date parse fails
+            i = len(self.items)
+            self.items.append(item)
+            self.posted_at.append(posted)
+            for key in set(item["title"].split()) | set(item["tags"]):
+                postings.setdefault(key, []).append(i)
+        self.postings = postings
+        self._word_memo = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def _word_candidates(self, word):
+        ids = self._word_memo.get(word)
+        if ids is None:
+            ids = set()
+            for key, rows in self.postings.items():
+                if word in key:
+                    ids.update(rows)
+            ids = frozenset(ids)
+            self._word_memo[word] = ids
+        return ids
+
+    def search(self, keyword, since=None, limit=None):
+        """Job cards matching keyword, posted after since (items without a date always pass)."""
+        words = keyword.split()
+        if words:
+            candidates = set.intersection(*(set(self._word_candidates(w)) for w in words))
+        else:
+            candidates = range(len(self.items))
+        cards = []
+        for i in sorted(candidates):
+            item = self.items[i]
+            if keyword not in item["title"] and not any(keyword in t for t in item["tags"]):
+                continue
+            posted = self.posted_at[i]
+            if since is not None and posted is not None and posted < since:
+                continue  # Skip old jobs
+            cards.append(item["card"])
+            if limit is not None and len(cards) >= limit:
+                break
+        return cards
+
+
+class FeedIngester:
+    """
+    Refreshes each source's FeedCache every interval seconds on a daemon
+    thread and rebuilds the FeedIndex when a payload changed.
+    sources: {name: (FeedCache, item normalizer)}.
+    """
+
+    def __init__(self, sources, interval=FEED_TTL_SECONDS):
+        self.sources = sources
+        self.interval = interval
+        self.index = FeedIndex([])
+        self._payloads = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self.rebuilds = 0
+        self.last_error = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="feed-ingester", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.ingest()
+            # A source never fetched or whose last refresh failed is retried sooner than the interval
+            retry = any(name not in self._payloads or feed.last_error for name, (feed, _) in self.sources.items())
+            self._stop.wait(min(self.interval, FEED_RETRY_SECONDS) if retry else self.interval)
+
+    def ingest(self):
+        """Pull every source once and publish a new index if anything changed."""
+        changed = False
+        for name, (feed, _) in self.sources.items():
+            payload = feed.refresh()
+            if payload is not None and payload is not self._payloads.get(name):
+                self._payloads[name] = payload
+                changed = True
+        if not changed:
+            return self.index
+        try:
+            items = []
+            for name, (_, normalize) in self.sources.items():
+                items.extend(normalize(j) for j in self._payloads.get(name) or [] if isinstance(j, dict))
+            self.index = FeedIndex(items, generation=self.index.generation + 1)
+            self.rebuilds += 1
+            self.last_error = None
+            logger.info(f"Feed index rebuilt: {len(self.index)} jobs, {len(self.index.postings)} keys")
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"Feed index rebuild failed: {e}")
+        return self.index
+
+    def stats(self):
+        return {
+            "jobs": len(self.index),
+            "keys": len(self.index.postings),
+            "generation": self.index.generation,
+            "rebuilds": self.rebuilds,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "last_error": self.last_error,
+            "sources": {name: feed.stats() for name, (feed, _) in self.sources.items()},
+        }
+
+
+feed_ingester = FeedIngester({"remoteok": (remoteok_feed, remoteok_item)})
+
+
+# --- concurrent sourcing ---
+_source_pool = ThreadPoolExecutor(max_workers=JOB_SOURCE_WORKERS, thread_name_prefix="job-source")
+
+
+def gather_sources(calls, deadline=JOB_SOURCE_DEADLINE_SECONDS):
+    """
+    Runs calls ([(label, fn, *args)]) concurrently and returns
+    (results, missed): the lists of jobs of the calls that finished within
+    deadline seconds, concatenated in call order, and the labels of those
+    that did not (still running, or raised).
+    """
+    futures = [(call[0], _source_pool.submit(*call[1:])) for call in calls]
+    wait([f for _, f in futures], timeout=deadline)
+    results, missed = [], []
+    for label, future in futures:
+        if not future.done():
+            future.cancel()
+            missed.append(label)
+            continue
+        try:
+            results.extend(future.result())
+        except Exception as e:
+            logger.warning(f"Job source {label} failed: {e}")
+            missed.append(label)
+    return results, missed
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import heapq
+import base64
+import logging
+import itertools
+import threading
+
+from cache import LRUCache
+
+# Materialized /job-matches results per (user, mode). A visit to the Job
+# Matches page is one dictionary read; the results are recomputed only
+# after something they depend on changed:
+#   - the user's resume (invalidate(uid), from /analyze-resume)
+#   - the /admin/jobs catalogue (jobs_changed())
+#   - the ingested job feed or the corpus TF-IDF model (their generation
+#     numbers, passed in as the "sources" stamp)
+# Other instances' events are not seen here, so entries also expire after
+# MATCH_CACHE_MAX_AGE_MINUTES.
+#
+# Results are stored unsorted; page() picks one page with a heap, ordered
+# by match (best first) and then by position, the order of a stable sort.
+
+logger = logging.getLogger(__name__)
+
+MATCH_CACHE_MAX_USERS = int(os.getenv("MATCH_CACHE_MAX_USERS", "2048"))
+MATCH_CACHE_MAX_AGE_MINUTES = float(os.getenv("MATCH_CACHE_MAX_AGE_MINUTES", "30"))
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(match, position):
+    raw = json.dumps([match, position], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        match, position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(match), int(position)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("cursor is not valid") from e
+
+
+def sort_key(results):
+    return lambda i: (-results[i]["match"], i)
+
+
+def ranked(results):
+    """All results, best match first (ties in computed order)."""
+    return [results[i] for i in sorted(range(len(results)), key=sort_key(results))]
+
+
+def page(results, limit, cursor=None):
+    """
+    (page, next_cursor): the limit best results after cursor. A cursor is a
+    (match, position) key, so it keeps working after the results were
+    recomputed: the next page starts below the last score the client saw.
+    """
+    key = sort_key(results)
+    rows = range(len(results))
+    if cursor:
+        after = decode_cursor(cursor)
+        after = (-after[0], after[1])
+        rows = (i for i in rows if key(i) > after)
+    top = heapq.nsmallest(limit + 1, rows, key=key)
+    more = len(top) > limit
+    top = top[:limit]
+    next_cursor = encode_cursor(results[top[-1]]["match"], top[-1]) if more else None
+    return [results[i] for i in top], next_cursor
+
+
+class MatchStore:
+    """
+    invalidate(uid) drops the user's stored results at once; the tick of the
+    change is only remembered while a computation that began before it is in
+    flight (begin() ... end()), so its put() can be rejected.
+    """
+
+    def __init__(self, max_users=MATCH_CACHE_MAX_USERS, max_age_minutes=MATCH_CACHE_MAX_AGE_MINUTES):
+        self.max_age = max_age_minutes * 60
+        self._entries = LRUCache(max_entries=max_users)
+        self._clock = itertools.count(1)   # orders computations against invalidations
+        self._in_flight = set()            # ticks of computations between begin() and end()
+        self._user_changed = {}            # uid -> tick of a resume change newer than the oldest in-flight computation
+        self._jobs_changed = 0             # tick of the last catalogue change
+        self._modes = set()
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        self.stale = 0
+
+    def begin(self, sources):
+        """
+        Stamp for a computation about to start; call end(stamp) when it is over.
+        sources: hashable state the results depend on (feed / model
+        generations), compared on get().
+        """
+        with self._lock:
+            tick = next(self._clock)
+            self._in_flight.add(tick)
+        return (tick, sources)
+
+    def end(self, stamp):
+        with self._lock:
+            self._in_flight.discard(stamp[0])
+            # Changes older than every computation still running can no longer reject a put()
+            oldest = min(self._in_flight, default=None)
+            if oldest is None:
+                self._user_changed.clear()
+            else:
+                self._user_changed = {uid: t for uid, t in self._user_changed.items() if t > oldest}
+
+    def get(self, uid, mode, sources):
+        """The stored results, or None when missing or out of date."""
+        entry = self._entries.get((uid, mode))
+        if entry is None:
+            return None
+        (tick, entry_sources), computed_at, results = entry
+        if (
+            entry_sources != sources
+            or tick < self._jobs_changed
+            or time.time() - computed_at > self.max_age
+        ):
+            self._entries.pop((uid, mode))
+            self.stale += 1
+            return None
+        return results
+
+    def put(self, uid, mode, stamp, results):
+        """Stores results computed since begin(); dropped if the user or catalogue changed meanwhile."""
+        tick, _ = stamp
+        with self._lock:
+            if tick < max(self._user_changed.get(uid, 0), self._jobs_changed):
+                return
+            self._modes.add(mode)
+            self._entries.put((uid, mode), (stamp, time.time(), results))
+
+    def invalidate(self, uid):
+        """The user's resume changed."""
+        with self._lock:
+            for mode in self._modes:
+                self._entries.pop((uid, mode))
+            if self._in_flight:
+                self._user_changed[uid] = next(self._clock)
+            self.invalidations += 1
+
+    def jobs_changed(self):
+        """A job was added to or deleted from the catalogue: every user's matches are stale."""
+        with self._lock:
+            self._jobs_changed = next(self._clock)
+            self.invalidations += 1
+
+    def stats(self):
+        return {
+            **self._entries.stats(),
+            "in_flight": len(self._in_flight),
+            "tracked_changes": len(self._user_changed),
+            "invalidations": self.invalidations,
+            "stale_dropped": self.stale,
+        }
+
+
+match_store = MatchStore()
@@ -0,0 +1,283 @@
+import io
+import os
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Extraction budget. Downstream consumers only look at the first ~15k chars
+# (see ai_resume_service.py), so anything past these limits is wasted work.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "50000"))
+PDF_DEADLINE_SECONDS = float(os.getenv("PDF_DEADLINE_SECONDS", "10"))
+
+# "auto" = probe first and pick the cheapest extractor likely to succeed,
+# "pdfminer" = always pdfminer first (previous behaviour)
+PDF_EXTRACTOR_MODE = os.getenv("PDF_EXTRACTOR_MODE", "auto")
+
+# Probe settings
+PROBE_PAGES = 3
+PROBE_MIN_FIRST_PAGE_CHARS = 200
+# Text-showing operators: (..) Tj, [..] TJ, <..> Tj, and the ' / " variants
+TEXT_OPERATOR_RE = re.compile(rb"(?:\)|\]|>)\s*(?:Tj|TJ|'|\")")
+# Nested Form XObjects followed by the probe
+MAX_XOBJECT_DEPTH = 4
+
+
+class ExtractionBudget:
+    """Page cap, character budget and wall-clock deadline for one extraction."""
+
+    def __init__(self, max_pages=None, max_chars=None, deadline_seconds=None):
+        self.max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+        self.max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+        seconds = PDF_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+        self.deadline = time.monotonic() + seconds
+
+    def exceeded(self, pages_read, chars_read):
+        """Returns the truncation reason ("pages" | "chars" | "deadline") or None."""
+        if self.max_chars and chars_read >= self.max_chars:
+            return "chars"
+        if self.max_pages and pages_read >= self.max_pages:
+            return "pages"
+        if time.monotonic() >= self.deadline:
+            return "deadline"
+        return None
+
+
+def _as_stream(source):
+    """bytes -> BytesIO; file objects / mmaps are rewound and used in place."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _result(text, pages_read, total_pages, reason, budget):
+    # The budget is only checked between pages, so the last page may overshoot
+    if budget.max_chars and len(text) > budget.max_chars:
+        text = text[: budget.max_chars]
+        reason = reason or "chars"
+    return {
+        "text": text,
+        "pages_read": pages_read,
+        "total_pages": total_pages,
+        "truncated": reason is not None,
+        "truncated_reason": reason,
+    }
+
+
+def extract_pdfminer_pages(source, budget=None):
+    """
+    Page-by-page pdfminer extraction (same layout settings as
+    pdfminer.high_level.extract_text) that stops once the budget is spent.
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    budget = budget or ExtractionBudget()
+    output = io.StringIO()
+    parser = PDFParser(_as_stream(source))
+    doc = PDFDocument(parser)
+    try:
+        total_pages = int(resolve1(resolve1(doc.catalog["Pages"])["Count"]))
+    except Exception:
+        total_pages = 0
+
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = TextConverter(rsrcmgr, output, codec="utf-8", laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+    pages_read = 0
+    reason = None
+    try:
+        for page in PDFPage.create_pages(doc):
+            reason = budget.exceeded(pages_read, output.tell())
+            if reason:
+                break
+            interpreter.process_page(page)
+            pages_read += 1
+        text = output.getvalue()
+    finally:
+        device.close()
+
+    total_pages = max(total_pages, pages_read)
+    return _result(text, pages_read, total_pages, reason, budget)
+
+
+def extract_pypdf_pages(source, budget=None, reader=None, first_page_text=None):
+    """
+    Page-by-page pypdf extraction under the same budget.
+    reader / first_page_text let the tiered engine reuse what probe_pdf() already parsed.
+    """
+    import pypdf
+
+    budget = budget or ExtractionBudget()
+    if reader is None:
+        reader = pypdf.PdfReader(_as_stream(source))
+    total_pages = len(reader.pages)
+
+    parts = []
+    chars = 0
+    pages_read = 0
+    reason = None
+    for page in reader.pages:
+        reason = budget.exceeded(pages_read, chars)
+        if reason:
+            break
+        if pages_read == 0 and first_page_text is not None:
+            extracted = first_page_text
+        else:
+            extracted = page.extract_text()
+        pages_read += 1
+        if extracted:
+            parts.append(extracted)
+            chars += len(extracted) + 1
+
+    return _result("\n".join(parts), pages_read, total_pages, reason, budget)
+
+
+def _page_content_bytes(page):
+    contents = page.get("/Contents")
+    if contents is None:
+        return b""
+    contents = contents.get_object()
+    if hasattr(contents, "get_data"):
+        return contents.get_data()
+    return b"".join(part.get_object().get_data() for part in contents)
+
+
+def _looks_like_text(text):
+    """Rejects pypdf output where words are glued together or mostly symbols."""
+    words = text.split()
+    if not words:
+        return False
+    long_words = sum(1 for w in words if len(w) > 25)
+    alnum = sum(1 for c in text if c.isalnum())
+    return long_words / len(words) < 0.05 and alnum / max(len(text), 1) > 0.5
+
+
+def _probe_content(resources, content, probe, depth=0):
+    """Font resources / text operators of a content stream and of the Form XObjects it draws (q /Fm0 Do Q)."""
+    resources = resources.get_object() if resources is not None else {}
+    if resources.get("/Font"):
+        probe["has_fonts"] = True
+    if TEXT_OPERATOR_RE.search(content):
+        probe["has_text_ops"] = True
+    xobjects = resources.get("/XObject")
+    if xobjects is None or depth >= MAX_XOBJECT_DEPTH:
+        return
+    for ref in xobjects.get_object().values():
+        if probe["has_fonts"] and probe["has_text_ops"]:
+            return
+        xobject = ref.get_object()
+        if xobject.get("/Subtype") == "/Form":
+            _probe_content(xobject.get("/Resources"), xobject.get_data(), probe, depth + 1)
+
+
+def probe_pdf(source):
+    """
+    Cheap look at the first few pages (pypdf objects only, no layout analysis):
+    font resources, text-showing operators in the content streams and the
+    first page's pypdf yield. Returns the probe facts plus the parsed reader
+    so the chosen extractor does not re-parse the file.
+    """
+    import pypdf
+
+    reader = pypdf.PdfReader(_as_stream(source))
+    probe = {"pages": len(reader.pages), "has_fonts": False, "has_text_ops": False,
+             "first_page_chars": 0, "first_page_text": "", "first_page_ok": False}
+
+    for page in reader.pages[:PROBE_PAGES]:
+        _probe_content(page.get("/Resources"), _page_content_bytes(page), probe)
+        if probe["has_fonts"] and probe["has_text_ops"]:
+            break
+
+    if probe["has_text_ops"] and reader.pages:
+        text = reader.pages[0].extract_text() or ""
+        probe["first_page_text"] = text
+        probe["first_page_chars"] = len(text)
+        probe["first_page_ok"] = len(text) >= PROBE_MIN_FIRST_PAGE_CHARS and _looks_like_text(text)
+
+    return probe, reader
+
+
+def extract_pdf(source, budget=None, mode=None):
+    """
+    Tiered PDF extraction engine (source: bytes or a binary file object / mmap):
+      1. probe (cheap)             -> no text layer? stop, caller goes to the raw-file (Vision OCR) route
+      2. pypdf                     -> when the first page already extracts cleanly (fastest)
+      3. pdfminer                  -> layout-aware, slower; used when pypdf looks unreliable
+      4. pypdf fallback            -> when pdfminer yields < 50 chars
+    Returns the extraction report with "extractor", "fallback_reason" and
+    per-stage "timings_ms".
+    """
+    budget = budget or ExtractionBudget()
+    mode = mode or PDF_EXTRACTOR_MODE
+    timings = {}
+    report = None
+    reader = None
+    extractor = None
+    fallback_reason = None
+
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[stage] = round((time.perf_counter() - start) * 1000, 2)
+
+    if mode == "auto":
+        try:
+            probe, reader = timed("probe", probe_pdf, source)
+        except Exception as e:
+            logger.warning(f"PDF probe failed, using pdfminer: {e}")
+            probe = None
+            fallback_reason = "probe_failed"
+
+        if probe is not None and not probe["has_fonts"] and not probe["has_text_ops"]:
+            report = _result("", 0, probe["pages"], None, budget)
+            extractor = "none"
+            fallback_reason = "no_text_layer"
+        elif probe is not None and probe["first_page_ok"]:
+            try:
+                report = timed("pypdf", extract_pypdf_pages, source, budget, reader, probe["first_page_text"])
+                extractor = "pypdf"
+            except Exception as e:
+                logger.warning(f"pypdf failed after a good probe: {e}")
+                fallback_reason = "pypdf_error"
+        elif probe is not None:
+            fallback_reason = "probe_low_yield"
+
+    if report is None:
+        try:
+            report = timed("pdfminer", extract_pdfminer_pages, source, budget)
+            extractor = "pdfminer"
+        except Exception as e:
+            logger.warning(f"pdfminer failed: {e}")
+            fallback_reason = "pdfminer_error"
+
+        if report is None or len(report["text"]) < 50:
+            if report is not None:
+                fallback_reason = "pdfminer_low_yield"
+            try:
+                fallback = timed("pypdf_fallback", extract_pypdf_pages, source, budget, reader)
+                if report is None or len(fallback["text"]) >= len(report["text"]):
+                    report = fallback
+                    extractor = "pypdf"
+            except Exception as e:
+                logger.warning(f"pypdf failed: {e}")
+
+    if report is None:
+        report = _result("", 0, 0, None, budget)
+        extractor = "none"
+
+    report["extractor"] = extractor
+    report["fallback_reason"] = fallback_reason
+    report["timings_ms"] = timings
+    return report
@@ -0,0 +1,140 @@
+import re
+from collections import defaultdict
+
+# Declarative resume quality rules (used by resume_analysis.analyze_quality).
+# All rules are compiled once into a single combined regex and evaluated in
+# one finditer() pass over the lowercased text, however many there are. To
+# add a check, append a rule here; it does not add a pass over the text.
+#
+#   "name"        unique id; matched texts are reported under it
+#   "group"       rules are reported by group, in list order
+#   one of:
+#   "words"       whole words / phrases
+#   "substrings"  plain substrings (like `kw in text_lower`)
+#   "pattern"     a regex over the lowercased text, no capturing groups
+#   "missing"     message when the rule never matches          (optional)
+#   "found"       message when it matches; {match} is the text  (optional)
+#
+# Checks that need more than "present / absent" (counts, section headings)
+# read scan().matches[name] in analyze_quality.
+#
+# Words and substrings of all rules share one alternation each (Python's re
+# scans a plain alternation of literals far faster than one group per rule);
+# the rule is then looked up from the matched text. Matches do not overlap:
+# at a given position patterns win over words, words over substrings, so a
+# pattern must not consume text other rules look for.
+
+
+def _alternation(terms):
+    # Longest first, so "personal projects" is preferred over "projects"
+    return "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+
+
+STRONG_VERBS = [
+    "led", "developed", "created", "managed", "designed", "architected", "implemented", "optimized", "achieved",
+    "spearheaded", "orchestrated", "engineered", "facilitated", "mentored"
+]
+
+# "Weak" verb -> stronger alternatives
+WEAK_VERBS = {
+    "worked": ["Collaborated", "Contributed", "Engineered"],
+    "helped": ["Assisted", "Facilitated", "Supported"],
+    "made": ["Built", "Constructed", "Developed"],
+    "used": ["Utilized", "Leveraged", "Deployed"],
+    "responsible": ["Accountable for", "Led", "Oversaw"]
+}
+
+# Section keywords, consulted when the segmenter found no heading for a section
+SECTION_KEYWORDS = {
+    "experience": ["experience", "employment", "work history"],
+    "education": ["education", "academic", "qualification"],
+    "skills": ["skills", "technologies", "competencies"],
+    "projects": ["projects", "personal projects"]
+}
+
+RULES = [
+    # Contact info. The email pattern starts at the "@" (checking the character
+    # before it) so the scan does not try an address at every letter, and only
+    # consumes the "@": the domain is left to the other rules ("jane@skills.dev").
+    {"name": "email", "group": "contact", "pattern": r"@(?<=[a-z0-9._%+-]@)(?=[a-z0-9.-]+\.[a-z]{2,})",
+     "missing": "⚠️ Missing Email Address"},
+    {"name": "phone", "group": "contact", "pattern": r"\b\d{10,}\b|\+\d{1,3}[-.\s]?\d{10}",
+     "missing": "⚠️ Missing Phone Number"},
+    {"name": "linkedin", "group": "contact", "substrings": ["linkedin.com"],
+     "missing": "💡 Add your LinkedIn Profile URL"},
+    # Section keywords
+    *[
+        {"name": f"section:{section}", "group": "sections", "substrings": keywords}
+        for section, keywords in SECTION_KEYWORDS.items()
+    ],
+    # Action verbs
+    {"name": "strong_verb", "group": "verbs", "words": STRONG_VERBS},
+    *[
+        {"name": f"weak_verb:{weak}", "group": "wording", "words": [weak],
+         "found": f"⚠️ Smart Tip: Swap '{weak}' with stronger words like '{strong[0]}' or '{strong[1]}'"}
+        for weak, strong in WEAK_VERBS.items()
+    ],
+]
+
+
+class Findings:
+    """Result of one scan: rule name -> set of matched texts."""
+
+    def __init__(self, rules, matches):
+        self._rules = rules
+        self.matches = matches
+
+    def found(self, name):
+        return bool(self.matches.get(name))
+
+    def messages(self, group):
+        """The "missing" / "found" messages of a group's rules, in rule order."""
+        out = []
+        for rule in self._rules:
+            if rule["group"] != group:
+                continue
+            matched = self.matches.get(rule["name"])
+            if not matched and rule.get("missing"):
+                out.append(rule["missing"])
+            elif matched and rule.get("found"):
+                out.append(rule["found"].format(match=min(matched)))
+        return out
+
+
+class RuleEngine:
+    """Compiles the rules once into one combined pattern."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._names = {}      # named group -> rule name ("pattern" rules)
+        self._literals = {}   # matched word / substring -> rule name
+        parts = []
+        words, substrings = [], []
+        for i, rule in enumerate(rules):
+            if "pattern" in rule:
+                group = f"r{i}"
+                self._names[group] = rule["name"]
+                parts.append(f"(?P<{group}>{rule['pattern']})")
+            for key, terms in (("words", words), ("substrings", substrings)):
+                for term in rule.get(key, ()):
+                    term = term.lower()
+                    if term not in self._literals:
+                        self._literals[term] = rule["name"]
+                        terms.append(term)
+        if words:
+            parts.append(rf"\b(?:{_alternation(words)})\b")
+        if substrings:
+            parts.append(_alternation(substrings))
+        self.pattern = re.compile("|".join(parts))
+
+    def scan(self, text):
+        """Evaluates every rule in a single pass over text.lower()."""
+        matches = defaultdict(set)
+        for m in self.pattern.finditer(text.lower()):
+            matched = m.group()
+            name = self._names[m.lastgroup] if m.lastgroup else self._literals[matched]
+            matches[name].add(matched)
+        return Findings(self.rules, matches)
+
+
+quality_rules = RuleEngine(RULES)
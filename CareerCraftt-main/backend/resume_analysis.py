@@ -0,0 +1,370 @@
+import os
+import re
+import math
+import hashlib
+import mmap
+import time
+import logging
+from contextlib import contextmanager
+from collections import Counter
+import spacy
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Resume parsing & ATS scoring.
+# Kept free of FastAPI/Firebase imports so it can be loaded inside
+# the resume_pipeline worker processes.
+
+from pdf_extractor import ExtractionBudget, extract_pdf
+from docx_extractor import extract_docx
+from cache import LRUCache
+from batch_scorer import score_jobs
+from tfidf_model import tfidf_store
+from skill_taxonomy import skill_matcher
+from quality_rules import quality_rules
+from resume_sections import segment_resume, section_types
+
+logger = logging.getLogger(__name__)
+
+# "fast" (default): analyze_content() only reads token text, is_stop, is_punct
+# and pos_, so the parser, NER and lemmatizer are never loaded or run.
+# "full": the whole en_core_web_sm pipeline (previous behaviour).
+NLP_MODE = os.getenv("NLP_MODE", "fast")
+FAST_NLP_EXCLUDE = ["parser", "ner", "lemmatizer"]
+NLP_BATCH_SIZE = 32
+
+def load_nlp(mode=None):
+    mode = mode or NLP_MODE
+    exclude = FAST_NLP_EXCLUDE if mode == "fast" else []
+    return spacy.load("en_core_web_sm", exclude=exclude)
+
+def nlp_fingerprint(pipeline=None):
+    """Model name, version and the components actually loaded, e.g. "en_core_web_sm-3.8.0[tok2vec,tagger]"."""
+    pipeline = pipeline or nlp
+    meta = pipeline.meta
+    return (f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+            f"[{','.join(pipeline.pipe_names)}]")
+
+# Load Spacy Model
+try:
+    nlp = load_nlp()
+except:
+    print("Downloading Spacy Model...")
+    from spacy.cli import download
+    download("en_core_web_sm")
+    nlp = load_nlp()
+
+
+def extract_text(file_bytes, filename):
+    # Takes bytes and filename, returns string
+    return extract_resume(file_bytes, filename)["text"]
+
+@contextmanager
+def open_source(source):
+    """
+    Yields something the extractors can read: bytes as-is, or a read-only
+    memory map of a spooled upload (path) so large files are never copied.
+    """
+    if not isinstance(source, str):
+        yield source
+        return
+    with open(source, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+def extract_resume(file_bytes, filename):
+    """
+    Same as extract_text() but returns an extraction report:
+    {"text", "sections", "pages_read", "total_pages", "truncated", "truncated_reason",
+     "extractor", "fallback_reason", "timings_ms", "duration_ms"}.
+    "sections" is the segment_resume() output, computed here once so every
+    analyzer (and the extraction cache) can reuse it.
+    PDFs go through the tiered engine in pdf_extractor.py and stop at the
+    ExtractionBudget (page cap, char budget, deadline).
+    file_bytes may also be the path of a spooled upload (see upload_ingest.py).
+    """
+    start = time.perf_counter()
+    report = _extract_resume(file_bytes, filename)
+    # Time spent in the worker, excluding pool queueing (see extraction_metrics.py)
+    report["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return report
+
+def _extract_resume(file_bytes, filename):
+    report = {"text": "", "sections": [], "pages_read": 0, "total_pages": 0, "truncated": False, "truncated_reason": None,
+              "extractor": None, "fallback_reason": None, "timings_ms": {}}
+    try:
+        if filename.lower().endswith(".pdf"):
+            # Tiered engine: cheap probe, then the fastest extractor likely to succeed.
+            # One budget for the whole file, shared by every stage.
+            with open_source(file_bytes) as source:
+                report = extract_pdf(source, ExtractionBudget())
+            # Counted per reason by extraction_metrics.record() from the report (this runs in a pool
+            # worker, whose metrics would never reach /extraction-stats)
+            if report["fallback_reason"]:
+                logger.info(f"PDF extraction fallback: {report['fallback_reason']} ({report['extractor']})")
+
+            if report["truncated"]:
+                logger.info(
+                    f"PDF extraction truncated ({report['truncated_reason']}): "
+                    f"{report['pages_read']}/{report['total_pages']} pages, {len(report['text'])} chars"
+                )
+            report["sections"] = segment_resume(report["text"])
+            return report
+
+        elif filename.lower().endswith(".docx"):
+            # Native DOCX extraction (No dependencies required), streamed part by part
+            try:
+                with open_source(file_bytes) as source:
+                    docx_report = extract_docx(source, max_chars=ExtractionBudget().max_chars)
+                report.update(
+                    text=docx_report["text"],
+                    truncated=docx_report["truncated"],
+                    truncated_reason=docx_report["truncated_reason"],
+                    extractor="docx",
+                    sections=segment_resume(docx_report["text"]),
+                )
+                return report
+            except Exception as e:
+                print(f"⚠️ Native DOCX extraction failed: {e}")
+                return report
+        return report
+    except Exception as e:
+        print(f"❌ Error extracting text from {filename}: {e}")
+        return report
+
+# IGNORE these common non-skill words to improve accuracy
+JD_STOP_WORDS = {
+    "experience", "role", "team", "candidate", "work", "knowledge", "proficiency", 
+    "understanding", "familiarity", "ability", "skills", "qualifications", "preferred",
+    "internship", "technologies", "environment", "solutions", "problems", "management",
+    "degree", "university", "graduate", "student", "level", "entry", "years", "job", 
+    "description", "responsibilities", "requirements", "plus", "history", "employment",
+    "apis", "assist", "backend", "control", "dashboards", "database", "device", "issues",
+    "infrastructure", "introduction"
+}
+
+def resume_tokens(resume_text):
+    """Lowercased non-stopword, non-punctuation tokens of the resume, plus its canonical skills."""
+    # is_stop / is_punct are lexical attributes: the tokenizer alone is enough
+    tokens = {token.text.lower() for token in nlp.make_doc(resume_text.lower()) if not token.is_stop and not token.is_punct}
+    # "Machine learning", "k8s", "node.js" -> canonical skills (see skill_taxonomy.py)
+    return tokens | skill_matcher.values(resume_text)
+
+def _phrase_words(phrase):
+    # The cleaned words a matched skill phrase spans ("node.js" -> node, js, nodejs)
+    words = set(re.findall(r'[a-z0-9]+', phrase))
+    words.add(re.sub(r'[^a-z0-9]', '', phrase))
+    return words
+
+def jd_keywords_from_doc(jd_doc):
+    """
+    "Important words" of a tagged JD: canonical skills from the taxonomy, plus
+    nouns / proper nouns not in JD_STOP_WORDS that are not part of one of them.
+    """
+    jd_keywords = set()
+    for token in jd_doc:
+         # We want Nouns/Proper Nouns that are NOT in our stop list
+         if token.pos_ in ["PROPN", "NOUN"] and not token.is_stop and not token.is_punct:
+            clean_word = re.sub(r'[^a-zA-Z0-9]', '', token.text).lower()
+            if len(clean_word) > 2 and clean_word not in JD_STOP_WORDS:
+                jd_keywords.add(clean_word)
+    # "Spring Boot" is one skill to match, not "spring" and "boot"
+    for skill, phrase in skill_matcher.find(jd_doc.text):
+        jd_keywords -= _phrase_words(phrase)
+        jd_keywords.add(skill)
+    return jd_keywords
+
+def jd_keywords(jd_text):
+    return jd_profile(jd_text)["keywords"]
+
+# Same tokenization / stop-word filtering as TfidfVectorizer(stop_words='english')
+tfidf_analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+# idf of a term that occurs in only one of the two documents (smooth_idf: ln(3/2) + 1);
+# terms in both documents get ln(3/3) + 1 = 1
+SINGLE_DOC_IDF = math.log(1.5) + 1
+
+def term_counts(text):
+    return Counter(tfidf_analyzer(text))
+
+def tfidf_cosine(resume_counts, jd_counts):
+    """
+    Cosine of the two l2-normalised rows TfidfVectorizer().fit_transform([resume, jd])
+    would produce, computed from cached term counts without refitting, 0-100.
+    """
+    if not resume_counts or not jd_counts:
+        return 0.0
+    shared = resume_counts.keys() & jd_counts.keys()
+    if not shared:
+        return 0.0
+
+    def norm(counts):
+        return math.sqrt(sum((n if t in shared else n * SINGLE_DOC_IDF) ** 2 for t, n in counts.items()))
+
+    dot = sum(resume_counts[t] * jd_counts[t] for t in shared)
+    return dot / (norm(resume_counts) * norm(jd_counts)) * 100
+
+def tfidf_similarity(resume_text, jd_text):
+    # TF-IDF Cosine Similarity (Context Match), 0-100
+    return tfidf_cosine(term_counts(resume_text), jd_profile(jd_text)["term_counts"])
+
+# JD profiles (keyword set + TF-IDF term counts), keyed by a hash of the JD text.
+# The same few hundred JDs / job "skills" strings are scored against many resumes.
+JD_CACHE_ENTRIES = int(os.getenv("JD_CACHE_ENTRIES", "1024"))
+jd_cache = LRUCache(max_entries=JD_CACHE_ENTRIES)
+
+def jd_cache_key(jd_text):
+    return hashlib.sha1(jd_text.encode("utf-8")).hexdigest()
+
+def jd_profile(jd_text, jd_doc=None):
+    """
+    {"keywords": frozenset, "term_counts": Counter} for a JD, memoized.
+    jd_doc: an already tagged Doc (from nlp.pipe) to use on a cache miss.
+    """
+    key = jd_cache_key(jd_text)
+    profile = jd_cache.get(key)
+    if profile is None:
+        if jd_doc is None:
+            jd_doc = nlp(jd_text)
+        profile = {
+            "keywords": frozenset(jd_keywords_from_doc(jd_doc)),
+            "term_counts": term_counts(jd_text),
+        }
+        jd_cache.put(key, profile)
+    return profile
+
+def hybrid_score(tfidf_score, resume_tokens, jd_keywords):
+    """Combines the context and keyword matches into (score, missing_keywords_list)."""
+    if not jd_keywords:
+        return round(tfidf_score, 2), []
+
+    # Count Matches
+    matched_count = 0
+    missing = []
+    
+    for kw in jd_keywords:
+        if kw in resume_tokens:
+            matched_count += 1
+        else:
+            missing.append(kw.capitalize())
+
+    keyword_score = (matched_count / len(jd_keywords)) * 100
+    
+    # 3. Hybrid Score formula
+    # PRIORITIZE KEYWORDS (Accuracy) - 80% Weight
+    # Context (TF-IDF) - 20% Weight
+    
+    if tfidf_score < 15:
+        final_score = keyword_score # Resume content might be broken, trust keywords
+    else:
+        final_score = (0.8 * keyword_score) + (0.2 * tfidf_score)
+        
+    # Cap score at 96% to be realistic (Nothing is perfect)
+    final_score = min(final_score, 96.0)
+
+    return round(final_score, 1), sorted(missing)[:15] # Top 15 missing words
+
+def analyze_content(resume_text, jd_text):
+    # Returns (score, missing_keywords_list)
+    # Always the full text: same input as resume_features (/job-matches, /admin/rank-students)
+    if not resume_text or not jd_text:
+        return 0.0, []
+    profile = jd_profile(jd_text)
+
+    # 1. TF-IDF Cosine Similarity (Context Match)
+    # Corpus idf when a fitted model exists (see tfidf_model.py), else the [resume, jd] pair fit
+    model = tfidf_store.get()
+    if model is not None:
+        tfidf_score = model.cosine(term_counts(resume_text), profile["term_counts"])
+    else:
+        tfidf_score = tfidf_cosine(term_counts(resume_text), profile["term_counts"])
+
+    # 2. Keyword Match (Skill Match)
+    return hybrid_score(tfidf_score, resume_tokens(resume_text), profile["keywords"])
+
+def jd_profiles(jd_texts):
+    """{jd_text: jd_profile()} for the non-empty JDs; cache misses are tagged in one nlp.pipe batch."""
+    profiles = {}
+    misses = []
+    for jd in jd_texts:
+        if jd and jd not in profiles:
+            profile = jd_cache.get(jd_cache_key(jd))
+            if profile is None:
+                misses.append(jd)
+            profiles[jd] = profile
+    for jd, jd_doc in zip(misses, nlp.pipe(misses, batch_size=NLP_BATCH_SIZE)):
+        profiles[jd] = jd_profile(jd, jd_doc)
+    return profiles
+
+def analyze_content_batch(resume_text, jd_texts, features=None):
+    """
+    analyze_content() for one resume against many JDs (e.g. /job-matches).
+    The resume is tokenized and counted once (or not at all when precomputed
+    features, see resume_features.py, are passed); JDs come from the JD cache
+    and are all scored together by batch_scorer.score_jobs().
+    Returns a list of (score, missing_keywords_list), same order as jd_texts.
+    """
+    if not resume_text:
+        return [(0.0, []) for _ in jd_texts]
+    if features is not None:
+        tokens, counts = features["tokens"], features["term_counts"]
+    else:
+        tokens = resume_tokens(resume_text)
+        counts = term_counts(resume_text)
+
+    profiles = jd_profiles(jd_texts)
+    # All jobs in one pass of sparse matrix products (see batch_scorer.py)
+    scored = [jd for jd in jd_texts if jd]
+    scores = dict(zip(scored, score_jobs(tokens, counts, [profiles[jd] for jd in scored], tfidf_store.get())))
+    return [scores[jd] if jd else (0.0, []) for jd in jd_texts]
+
+def analyze_quality(resume_text, sections=None):
+    suggestions = []
+    if sections is None:
+        sections = segment_resume(resume_text)
+    # Every regex / keyword check in one pass over the text (see quality_rules.py)
+    findings = quality_rules.scan(resume_text)
+
+    # 1. Contact Info Checks
+    suggestions += findings.messages("contact")
+
+    # 2. Section Checks (from the segmenter's headings)
+    required_sections = ["experience", "education", "skills", "projects"]
+    present = section_types(sections)
+    
+    for section in required_sections:
+        if section in present:
+            continue
+        # Heading not recognised (flattened PDF text, "EDUCATIONAL BACKGROUND"...): fall back to the keyword rules
+        if findings.found(f"section:{section}"):
+            continue
+        suggestions.append(f"🚫 Missing '{section.capitalize()}' section")
+
+    # 3. Content Length
+    word_count = len(resume_text.split())
+    if word_count < 200:
+        suggestions.append("⚠️ Resume is too short (< 200 words). Add more detail.")
+    elif word_count > 1500:
+        suggestions.append("⚠️ Resume might be too long (> 2 pages). Keep it concise.")
+
+    # 4. Action Verbs & Smart Rewriter
+    # Distinct strong verbs used
+    verb_count = len(findings.matches.get("strong_verb", ()))
+            
+    if verb_count < 3:
+        suggestions.append(f"💡 Use more action verbs like 'Managed' or 'Created' (Found only {verb_count})")
+
+    # Suggest replacements for weak verbs
+    suggestions += findings.messages("wording")
+
+    return suggestions
+
+def warm_up():
+    """Process pool initializer: force the spaCy model to load before the first task."""
+    nlp("warm up")
+
+def score_resume(resume_text, jd_text, sections=None):
+    """Pool task: ATS score + missing keywords + quality suggestions in one round trip."""
+    if sections is None:
+        sections = segment_resume(resume_text)
+    ats_score, missing = analyze_content(resume_text, jd_text)
+    suggestions = analyze_quality(resume_text, sections)
+    return ats_score, missing, suggestions
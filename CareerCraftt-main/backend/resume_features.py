@@ -0,0 +1,103 @@
+import hashlib
+import logging
+from collections import Counter
+
+# Processed resume features, computed once when a resume is analyzed and
+# stored next to resume_text in users/{uid}.resume_features, so
+# /job-matches reads them instead of re-tokenizing the resume per job.
+
+from resume_analysis import nlp_fingerprint, resume_tokens, term_counts
+from resume_sections import segment_resume
+from skill_taxonomy import find_roles
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever resume_tokens(), term_counts(), extract_roles_from_resume()
+# or the skill taxonomy change; stored features with another version are recomputed lazily.
+FEATURES_VERSION = "2"
+
+
+def features_version():
+    # The spaCy model and its loaded components (NLP_MODE, a stripped-down install)
+    # decide tokenization and stop words, so they are part of the version
+    return f"{FEATURES_VERSION}:{nlp_fingerprint()}"
+
+
+def text_hash(resume_text):
+    return hashlib.sha1((resume_text or "").encode("utf-8")).hexdigest()
+
+
+def extract_roles_from_resume(resume_text):
+    """
+    Extracts potential job roles from the resume text using the role taxonomy.
+    Returns a list of roles (e.g., ["Data Scientist", "Python Developer"]).
+    Defaults to ["Software Engineer"] if no matches found.
+    """
+    if not resume_text:
+        return ["Software Engineer"]
+
+    # One pass over the text with the role automaton (see skill_taxonomy.py);
+    # phrases only match on word boundaries, so "qa" does not fire inside "aqua"
+    found_roles = find_roles(resume_text)
+
+    # Limit to top 3 roles to avoid clutter
+    # Sort to ensure DETERMINISTIC output (Stable Track)
+    final_roles = sorted(list(found_roles))
+
+    # Priority Override: If Full Stack is present, put it first
+    if "Full Stack Developer" in final_roles:
+        final_roles.remove("Full Stack Developer")
+        final_roles.insert(0, "Full Stack Developer")
+
+    if not final_roles:
+        return ["Software Engineer"]
+
+    return final_roles[:5]
+
+
+def compute_resume_features(resume_text, sections=None):
+    """
+    Firestore-ready features of a resume. Term counts are stored as two
+    parallel arrays (terms / counts) rather than a map: compact, and free of
+    Firestore field-name restrictions.
+    """
+    counts = term_counts(resume_text)
+    terms = sorted(counts)
+    return {
+        "version": features_version(),
+        "text_sha1": text_hash(resume_text),
+        "tokens": sorted(resume_tokens(resume_text)),
+        "terms": terms,
+        "counts": [counts[t] for t in terms],
+        "roles": extract_roles_from_resume(resume_text),
+        "sections": sections if sections is not None else segment_resume(resume_text),
+    }
+
+
+def is_current(stored, resume_text):
+    """Stored features are usable if built by this scorer version from this exact text."""
+    return bool(stored) and stored.get("version") == features_version() and stored.get("text_sha1") == text_hash(resume_text)
+
+
+def load_features(stored):
+    """Stored (Firestore) form -> what the scorers consume."""
+    return {
+        "tokens": set(stored.get("tokens", [])),
+        "term_counts": Counter(dict(zip(stored.get("terms", []), stored.get("counts", [])))),
+        "roles": stored.get("roles") or ["Software Engineer"],
+        "sections": stored.get("sections", []),
+    }
+
+
+def resolve_resume_features(resume_text, stored):
+    """
+    Returns (features, refreshed): the usable features, and the new stored form
+    when the stored one was missing or stale (None otherwise) so the caller can
+    write it back.
+    """
+    if is_current(stored, resume_text):
+        return load_features(stored), None
+    if stored:
+        logger.info(f"Resume features version {stored.get('version')} is stale, recomputing")
+    refreshed = compute_resume_features(resume_text)
+    return load_features(refreshed), refreshed
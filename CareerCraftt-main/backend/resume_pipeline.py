@@ -0,0 +1,121 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import resume_analysis
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineBusy(Exception):
+    """Raised when the CPU stage already has max_pending tasks queued."""
+
+
+class PipelineTimeout(Exception):
+    """Raised when a task does not finish within its timeout."""
+
+
+class PipelineCrashed(PipelineBusy):
+    """
+    Raised when a worker process died while running the task. The pool is
+    restarted; callers treat it like PipelineBusy (503, retry later).
+    Not retried here: the same input would likely crash the fresh pool too.
+    """
+
+
+class ResumePipeline:
+    """
+    CPU stage for the resume endpoints (PDF/DOCX extraction, spaCy scoring).
+    Work runs in a ProcessPoolExecutor so pdfminer/spaCy never block the event loop,
+    which keeps /chat and /jobs responsive while resumes are being parsed.
+
+    - workers:      number of worker processes (0 = run in a thread, for dev boxes)
+    - task_timeout: seconds a request waits for its task before giving up
+    - max_pending:  queued + running tasks allowed before new work is rejected
+
+    Note: a timed-out task keeps running in its worker until it finishes; only the
+    waiting request is released.
+    """
+
+    def __init__(self, workers=2, task_timeout=30.0, max_pending=16, start_method="spawn"):
+        self.workers = workers
+        self.task_timeout = task_timeout
+        self.max_pending = max_pending
+        self.start_method = start_method
+        self._executor = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def _get_executor(self):
+        if self._executor is None and self.workers > 0:
+            ctx = multiprocessing.get_context(self.start_method)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=ctx,
+                initializer=resume_analysis.warm_up,
+            )
+            logger.info(f"Resume pipeline started ({self.workers} workers, {self.start_method})")
+        return self._executor
+
+    async def run(self, fn, *args, timeout=None):
+        """Runs fn(*args) in the pool and awaits the result."""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PipelineBusy(f"Resume pipeline is busy ({self._pending} tasks pending)")
+
+        timeout = self.task_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            executor = self._get_executor()
+            future = loop.run_in_executor(executor, fn, *args)
+            result = await asyncio.wait_for(future, timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PipelineTimeout(f"{getattr(fn, '__name__', 'task')} exceeded {timeout}s")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a hostile PDF); start a fresh pool next time
+            self.failures += 1
+            logger.error("Resume pipeline worker crashed; restarting pool")
+            self._reset()
+            raise PipelineCrashed("Resume pipeline worker crashed")
+        finally:
+            self._pending -= 1
+
+    def _reset(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "task_timeout": self.task_timeout,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+
+resume_pipeline = ResumePipeline(
+    workers=int(os.getenv("RESUME_POOL_WORKERS", str(min(2, os.cpu_count() or 1)))),
+    task_timeout=float(os.getenv("RESUME_TASK_TIMEOUT", "30")),
+    max_pending=int(os.getenv("RESUME_QUEUE_LIMIT", "16")),
+    start_method=os.getenv("RESUME_POOL_START_METHOD", "spawn"),
+)
@@ -0,0 +1,135 @@
+import re
+
+# Resume section segmentation.
+# One pass over the lines of the extracted text; the result is a list of
+# JSON-friendly dicts so it can be cached next to the text (see cache.py)
+# and shipped to/from the resume_pipeline workers.
+
+# Heading vocabulary per section type. A heading line may add modifiers
+# ("Technical Skills", "Work Experience"), so the LAST keyword on the line
+# decides the type: "Academic Projects" is a projects section.
+SECTION_KEYWORDS = {
+    "summary": ["summary", "profile", "objective", "about me"],
+    "experience": ["experience", "employment", "work history", "internships", "internship"],
+    "education": ["education", "academic", "academics", "qualification", "qualifications"],
+    "skills": ["skills", "technologies", "competencies", "tech stack"],
+    "projects": ["projects", "personal projects"],
+    "certifications": ["certifications", "certificates", "achievements", "awards"],
+}
+KEYWORD_TYPES = {kw: section for section, kws in SECTION_KEYWORDS.items() for kw in kws}
+HEADING_KEYWORD_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(map(re.escape, KEYWORD_TYPES), key=len, reverse=True)) + r")\b"
+)
+
+# A heading is a short line ("EXPERIENCE", "Technical Skills:") or a short
+# label followed by a colon and inline content ("Skills: Python, SQL")
+MAX_HEADING_CHARS = 40
+MAX_HEADING_WORDS = 4
+LINE_RE = re.compile(r"[^\n]*\n?")
+NON_ALPHA_RE = re.compile(r"[^a-z ]+")
+
+# Priority for packing a resume into an LLM prompt: what to keep when it does not fit
+PROMPT_PRIORITY = ["contact", "summary", "experience", "skills", "projects", "education", "certifications", "other"]
+
+
+def _heading_type(line):
+    stripped = line.strip().strip("•-*#|").strip()
+    if not stripped or stripped.endswith("."):
+        return None
+    label, colon, rest = stripped.partition(":")
+    if not colon and len(stripped) > MAX_HEADING_CHARS:
+        return None
+    if colon and len(label) > MAX_HEADING_CHARS:
+        return None
+    label = " ".join(NON_ALPHA_RE.sub(" ", label.lower()).split())
+    if not label or len(label.split()) > MAX_HEADING_WORDS:
+        return None
+    matches = HEADING_KEYWORD_RE.findall(label)
+    if not matches:
+        return None
+    return KEYWORD_TYPES[matches[-1]]
+
+
+def segment_resume(text):
+    """
+    Splits resume text into typed sections with character offsets:
+    [{"type", "heading", "start", "end"}, ...] covering the whole text in order.
+    Text before the first heading is the "contact" block (name, email, phone);
+    a resume with no recognisable headings is a single "other" section.
+    """
+    if not text:
+        return []
+
+    sections = []
+    current = {"type": "contact", "heading": None, "start": 0}
+    offset = 0
+    for match in LINE_RE.finditer(text):
+        line = match.group()
+        if not line:
+            break
+        section_type = _heading_type(line)
+        if section_type:
+            if offset > current["start"] or current["heading"]:
+                current["end"] = offset
+                sections.append(current)
+            heading = line.strip().partition(":")[0].strip()
+            current = {"type": section_type, "heading": heading, "start": offset}
+        offset += len(line)
+
+    current["end"] = len(text)
+    sections.append(current)
+
+    if len(sections) == 1 and sections[0]["type"] == "contact":
+        sections[0]["type"] = "other"
+    return sections
+
+
+def section_types(sections):
+    """Set of section types present, e.g. {"contact", "experience", "skills"}."""
+    return {s["type"] for s in sections or []}
+
+
+def has_headings(sections):
+    return any(s["heading"] for s in sections or [])
+
+
+def section_text(text, sections, types):
+    """Concatenated text of the sections of the given types, in document order."""
+    return "".join(text[s["start"]:s["end"]] for s in sections if s["type"] in types)
+
+
+def strip_sections(text, sections, types):
+    """The resume text without the sections of the given types."""
+    return "".join(text[s["start"]:s["end"]] for s in sections if s["type"] not in types)
+
+
+def pack_sections(text, sections=None, max_chars=15000):
+    """
+    Fits a resume into max_chars for an LLM prompt. Instead of cutting the
+    tail off, whole sections are kept in PROMPT_PRIORITY order and only the
+    lowest-priority section that still fits partially is truncated; the
+    kept sections are emitted in their original document order.
+    """
+    if not text or len(text) <= max_chars:
+        return text or ""
+    if sections is None:
+        sections = segment_resume(text)
+    if not sections:
+        return text[:max_chars]
+
+    def priority(item):
+        index, section = item
+        rank = PROMPT_PRIORITY.index(section["type"]) if section["type"] in PROMPT_PRIORITY else len(PROMPT_PRIORITY)
+        return rank, index
+
+    budget = max_chars
+    kept = {}
+    for index, section in sorted(enumerate(sections), key=priority):
+        if budget <= 0:
+            break
+        length = section["end"] - section["start"]
+        end = section["start"] + min(length, budget)
+        kept[index] = text[section["start"]:end]
+        budget -= end - section["start"]
+
+    return "".join(kept[i] for i in sorted(kept))
@@ -0,0 +1,214 @@
+import os
+import logging
+import threading
+
+import numpy as np
+
+# Latent semantic index of the job catalogue (/admin/jobs): TF-IDF followed by
+# TruncatedSVD, so "k8s" / "kubernetes" style co-occurring terms land close
+# together. All job vectors live in one contiguous float32 array of unit
+# rows; top-k cosine against a resume is one matrix-vector product plus
+# np.argpartition. Used by /job-matches?mode=semantic.
+#
+# Added jobs are folded into the existing space (transform only) and deleted
+# ones swap-removed; the space itself is refitted once enough of the
+# catalogue changed since the last fit.
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_DIMENSIONS = int(os.getenv("SEMANTIC_DIMENSIONS", "256"))
+SEMANTIC_REFIT_CHANGE_RATIO = float(os.getenv("SEMANTIC_REFIT_CHANGE_RATIO", "0.2"))
+# Catalogue jobs returned by /job-matches?mode=semantic
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "20"))
+# An SVD of fewer documents than this says nothing useful about synonyms
+MIN_SEMANTIC_DOCS = 5
+JOB_FIELDS = ("role", "skills", "description")
+
+
+def job_text(job):
+    parts = []
+    for field in JOB_FIELDS:
+        value = job.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(v) for v in value)
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+class SemanticSpace:
+    """A fitted TF-IDF + TruncatedSVD projection to unit float32 vectors."""
+
+    def __init__(self, documents, dimensions=SEMANTIC_DIMENSIONS):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.decomposition import TruncatedSVD
+
+        self.vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+        tfidf = self.vectorizer.fit_transform(documents)
+        # TruncatedSVD needs fewer components than both documents and terms
+        self.dimensions = max(1, min(dimensions, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=self.dimensions, random_state=42)
+        self.fitted_vectors = self._normalize(self.svd.fit_transform(tfidf))
+        self.n_docs = len(documents)
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def transform(self, texts):
+        return self._normalize(self.svd.transform(self.vectorizer.transform(texts)))
+
+
+class SemanticJobIndex:
+    """
+    Job id -> row of a contiguous (capacity x dimensions) float32 matrix.
+    The first len(self) rows are live; rows are appended on add() and the
+    last row is moved into the hole on remove(). Rows a query can see are
+    never written in place, so top_k() scores a consistent snapshot.
+    """
+
+    def __init__(self):
+        self.space = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._ids = []
+        self._jobs = []
+        self._rows = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._load_jobs = None
+        self._attempted = False
+        self._refitting = False
+        self.changes = 0
+        self.last_error = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def enable(self, load_jobs):
+        """load_jobs: callable returning the catalogue as [{"id", "role", "skills", ...}]."""
+        self._load_jobs = load_jobs
+
+    def ensure(self):
+        """True once an index is available, building it on first use."""
+        if self.space is None and self._load_jobs is not None and not self._attempted:
+            with self._build_lock:
+                if self.space is None and not self._attempted:
+                    self._attempted = True
+                    self.rebuild()
+        return self.space is not None
+
+    def rebuild(self, jobs=None):
+        jobs = [j for j in (jobs if jobs is not None else self._load_jobs()) if job_text(j).strip()]
+        if len(jobs) < MIN_SEMANTIC_DOCS:
+            logger.info(f"Semantic index not built: {len(jobs)} jobs (need {MIN_SEMANTIC_DOCS})")
+            return
+        space = SemanticSpace([job_text(j) for j in jobs])
+        with self._lock:
+            self.space = space
+            self._vectors = space.fitted_vectors
+            self._ids = [str(j.get("id")) for j in jobs]
+            self._jobs = list(jobs)
+            self._rows = {job_id: i for i, job_id in enumerate(self._ids)}
+            self.changes = 0
+        print(f"✅ Semantic job index: {len(jobs)} jobs, {space.dimensions} dimensions")
+
+    # --- incremental updates (/admin/jobs) ---
+    def add(self, job_id, job):
+        job = {**job, "id": job_id}
+        with self._lock:
+            if self.space is None:
+                self._attempted = False  # the catalogue may be big enough now
+                return
+            vector = self.space.transform([job_text(job)])[0]
+            n = len(self._ids)
+            if job_id in self._rows:
+                # Copy on write: top_k() may be reading the current array without the lock
+                self._vectors = self._vectors.copy()
+                self._vectors[self._rows[job_id]] = vector
+                self._jobs[self._rows[job_id]] = job
+            else:
+                if n == len(self._vectors):
+                    # Grow geometrically so appends stay amortized O(dimensions)
+                    grown = np.zeros((max(2 * n, 16), self.space.dimensions), dtype=np.float32)
+                    grown[:n] = self._vectors[:n]
+                    self._vectors = grown
+                self._vectors[n] = vector
+                self._ids.append(job_id)
+                self._jobs.append(job)
+                self._rows[job_id] = n
+            self.changes += 1
+        self._maybe_refit()
+
+    def remove(self, job_id):
+        with self._lock:
+            row = self._rows.pop(job_id, None)
+            if row is None:
+                return
+            last = len(self._ids) - 1
+            if row != last:
+                self._vectors = self._vectors.copy()
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = self._ids[last]
+                self._jobs[row] = self._jobs[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+            self._jobs.pop()
+            self.changes += 1
+        self._maybe_refit()
+
+    def _maybe_refit(self):
+        # Folded-in jobs only use terms the space was fitted on; refit once enough changed
+        if self._refitting or self._load_jobs is None or self.space is None:
+            return
+        if self.changes / max(self.space.n_docs, 1) < SEMANTIC_REFIT_CHANGE_RATIO:
+            return
+        self._refitting = True
+        threading.Thread(target=self._refit, name="semantic-refit", daemon=True).start()
+
+    def _refit(self):
+        try:
+            self.rebuild()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"Semantic index refit failed: {e}")
+        finally:
+            self._refitting = False
+
+    # --- queries ---
+    def search(self, query_text, k=20, texts=()):
+        """
+        Returns (top, scores): the k catalogue jobs closest to query_text as
+        [(job, cosine 0-100)], best first, and the cosine of each of texts
+        (jobs outside the catalogue, e.g. the live feed) to query_text.
+        """
+        with self._lock:
+            space = self.space
+            n = len(self._ids)
+            vectors = self._vectors[:n]
+            jobs = list(self._jobs)
+        query = space.transform([query_text])[0]
+        scores = np.clip(space.transform(list(texts)) @ query, 0.0, 1.0) * 100 if texts else np.zeros(0)
+        if not n or k < 1:
+            return [], scores
+
+        cosine = vectors @ query
+        k = min(k, n)
+        top = np.argpartition(-cosine, k - 1)[:k]
+        top = top[np.argsort(-cosine[top], kind="stable")]
+        return [(jobs[i], float(max(cosine[i], 0.0)) * 100) for i in top.tolist()], scores
+
+    def stats(self):
+        return {
+            "jobs": len(self),
+            "dimensions": self.space.dimensions if self.space else None,
+            "changes_since_fit": self.changes,
+            "refitting": self._refitting,
+            "last_error": self.last_error,
+        }
+
+
+semantic_jobs = SemanticJobIndex()
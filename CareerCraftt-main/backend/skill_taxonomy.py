@@ -0,0 +1,222 @@
+import re
+from collections import deque
+
+# Skill / role taxonomy: canonical name -> aliases, compiled into Aho-Corasick
+# automata so every canonical skill (or role) in a resume or JD is found in
+# one linear pass over the text, including multi-word skills ("machine
+# learning", "spring boot") and synonyms (k8s -> kubernetes, js -> javascript).
+# Matches must start and end on a word boundary, so "qa" does not fire
+# inside "aqua" nor "ios" inside "bios".
+
+# Canonical skill (lowercase, as shown in missing keywords) -> aliases
+SKILLS = {
+    # Languages
+    "python": ["python3"],
+    "java": [],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": [],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "golang": ["go lang"],
+    "rust": [],
+    "kotlin": [],
+    "swift": [],
+    "php": [],
+    "ruby": [],
+    "scala": [],
+    "sql": [],
+    "html": ["html5"],
+    "css": ["css3"],
+    "bash": ["shell scripting"],
+    # Frameworks / libraries
+    "react": ["react.js", "reactjs"],
+    "react native": [],
+    "angular": ["angular.js", "angularjs"],
+    "vue.js": ["vue", "vuejs"],
+    "next.js": ["nextjs"],
+    "node.js": ["nodejs", "node js"],
+    "express.js": ["expressjs"],
+    "django": [],
+    "flask": [],
+    "fastapi": ["fast api"],
+    "spring boot": ["springboot"],
+    "hibernate": [],
+    ".net": ["dotnet", "asp.net"],
+    "tensorflow": [],
+    "pytorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "pandas": [],
+    "numpy": [],
+    "flutter": [],
+    # Data / AI
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "artificial intelligence": ["ai"],
+    "natural language processing": ["nlp"],
+    "computer vision": [],
+    "data science": [],
+    "data analysis": ["data analytics"],
+    "data structures": ["dsa", "data structures and algorithms"],
+    "power bi": ["powerbi"],
+    "tableau": [],
+    # Databases
+    "mysql": [],
+    "postgresql": ["postgres"],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "firebase": ["firestore"],
+    # Cloud / DevOps
+    "aws": ["amazon web services"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "jenkins": [],
+    "ci/cd": ["cicd", "ci cd", "continuous integration"],
+    "git": ["github", "gitlab"],
+    "linux": ["unix"],
+    "microservices": ["micro services", "microservice"],
+    "rest api": ["rest apis", "restful", "restful api", "restful apis"],
+    "graphql": [],
+    # Practices
+    "object oriented programming": ["oop", "oops"],
+    "agile": ["scrum"],
+    "unit testing": ["junit", "pytest"],
+    "ui/ux": ["ui ux", "ux design", "ui design"],
+}
+
+# Role shown to the user -> resume phrases that suggest it (see resume_features.extract_roles_from_resume)
+ROLES = {
+    "Full Stack Developer": ["full stack", "full-stack", "fullstack"],
+    "Frontend Developer": ["frontend", "front end", "front-end"],
+    "Backend Developer": ["backend", "back end", "back-end"],
+    "Data Scientist": ["data scientist", "data science"],
+    "Data Analyst": ["data analyst"],
+    "Machine Learning Engineer": ["machine learning", "ml engineer"],
+    "DevOps Engineer": ["devops"],
+    "Mobile Developer": ["mobile developer"],
+    "Android Developer": ["android"],
+    "iOS Developer": ["ios"],
+    "React Native Developer": ["react native"],
+    "Game Developer": ["game developer"],
+    "QA Engineer": ["qa", "testing", "quality assurance"],
+    "Cybersecurity Analyst": ["cybersecurity", "cyber security"],
+    "Product Manager": ["product manager"],
+    "UI/UX Designer": ["ui/ux", "ui ux"],
+    "Web Developer": ["web developer"],
+    "Java Developer": ["java"],
+    "Python Developer": ["python"],
+    "React Developer": ["react", "react.js", "reactjs"],
+    "Node.js Developer": ["node", "node.js", "nodejs"],
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Lowercase with runs of whitespace collapsed, so "Machine\\nLearning" matches."""
+    return _WHITESPACE.sub(" ", (text or "").lower())
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over {phrase: value}. find() scans the text once and
+    keeps the leftmost-longest non-overlapping matches that sit on word
+    boundaries ("node.js" wins over "js", "react native" over "react").
+    """
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # per state: (phrase length, value) of every phrase ending here
+        for phrase, value in phrases.items():
+            self._add(normalize(phrase).strip(), value)
+        self._link()
+
+    def _add(self, phrase, value):
+        if not phrase:
+            return
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(phrase), value))
+
+    def _link(self):
+        # Breadth-first: a state's failure link is the longest proper suffix that is also a prefix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _scan(self, text):
+        """All boundary-respecting (start, end, value) matches in text (already normalized)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < n and text[end].isalnum():
+                continue
+            for length, value in out[state]:
+                start = end - length
+                if start and text[start - 1].isalnum():
+                    continue
+                matches.append((start, end, value))
+        return matches
+
+    def find(self, text):
+        """[(value, matched text)] of the leftmost-longest non-overlapping matches, in text order."""
+        text = normalize(text)
+        found = []
+        last_end = 0
+        for start, end, value in sorted(self._scan(text), key=lambda m: (m[0], -m[1])):
+            if start >= last_end:
+                found.append((value, text[start:end]))
+                last_end = end
+        return found
+
+    def values(self, text):
+        return {value for value, _ in self.find(text)}
+
+
+def _alias_map(taxonomy, include_key=True):
+    phrases = {}
+    for value, aliases in taxonomy.items():
+        for phrase in ([value] if include_key else []) + list(aliases):
+            phrases.setdefault(phrase, value)
+    return phrases
+
+
+skill_matcher = PhraseMatcher(_alias_map(SKILLS))
+# Role names themselves ("Full Stack Developer") are not phrases to look for
+role_matcher = PhraseMatcher(_alias_map(ROLES, include_key=False))
+
+
+def find_skills(text):
+    """Canonical skills mentioned in text."""
+    return skill_matcher.values(text)
+
+
+def find_roles(text):
+    """Roles suggested by text."""
+    return role_matcher.values(text)
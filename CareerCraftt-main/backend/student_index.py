@@ -0,0 +1,362 @@
+import os
+import re
+import json
+import time
+import uuid
+import shutil
+import tempfile
+import hashlib
+import logging
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from batch_scorer import SINGLE_DOC_IDF, MAX_MISSING_KEYWORDS
+
+# Reverse matching: one JD against every student of a college. Each
+# college's resume features (resume_features.py) are packed into two CSR
+# matrices (term counts for TF-IDF, keyword tokens) saved as .npy files and
+# memory-mapped, so ranking thousands of students is a few sparse
+# matrix-vector products. Scores are the same hybrid score /job-matches and
+# /analyze-resume compute (resume_analysis.hybrid_score).
+
+logger = logging.getLogger(__name__)
+
+STUDENT_INDEX_DIR = os.getenv(
+    "STUDENT_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "student_index")
+)
+# Rebuild an index older than this even if no resume change was reported to this process
+STUDENT_INDEX_MAX_AGE_MINUTES = float(os.getenv("STUDENT_INDEX_MAX_AGE_MINUTES", "60"))
+CURRENT_FILE = "CURRENT"
+# Superseded builds younger than this are left on disk for readers still loading them
+BUILD_GRACE_SECONDS = 60
+META_FILE = "meta.json"
+ARRAYS = ("counts_data", "counts_indices", "counts_indptr", "tokens_indices", "tokens_indptr", "total_sq")
+
+
+def college_key(college):
+    """Directory name for a college: readable slug + short hash (names differ only in case / punctuation)."""
+    slug = re.sub(r"[^a-z0-9]+", "_", college.lower()).strip("_")[:40]
+    return f"{slug}-{hashlib.sha1(college.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _csr_arrays(rows, index, with_counts=False):
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indices, data = [], []
+    for i, row in enumerate(rows):
+        terms = sorted(row)
+        indices.extend(index[t] for t in terms)
+        if with_counts:
+            data.extend(row[t] for t in terms)
+        indptr[i + 1] = len(indices)
+    return np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), indptr
+
+
+def _read_current(base):
+    try:
+        with open(os.path.join(base, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def build_index(college, students, out_dir=None, as_of=None):
+    """
+    Writes the index of a college and returns its directory.
+    students: [{"uid", "email", "features"}], features as returned by
+    resume_features.load_features() (tokens set, term_counts Counter).
+    as_of: when the students were read (defaults to now).
+    Each build goes to a new directory and CURRENT is switched atomically,
+    so readers never see a half-written index.
+    """
+    base = os.path.join(out_dir or STUDENT_INDEX_DIR, college_key(college))
+    terms = sorted(set().union(*(s["features"]["term_counts"].keys() | s["features"]["tokens"] for s in students)))
+    index = {t: i for i, t in enumerate(terms)}
+
+    counts_data, counts_indices, counts_indptr = _csr_arrays(
+        [s["features"]["term_counts"] for s in students], index, with_counts=True
+    )
+    _, tokens_indices, tokens_indptr = _csr_arrays([s["features"]["tokens"] for s in students], index)
+    total_sq = np.array(
+        [sum(float(n) ** 2 for n in s["features"]["term_counts"].values()) for s in students], dtype=np.float64
+    )
+
+    # Written to a private temp dir, then renamed: concurrent builds never share a directory
+    os.makedirs(base, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=".build-", dir=base)
+    arrays = {
+        "counts_data": counts_data, "counts_indices": counts_indices, "counts_indptr": counts_indptr,
+        "tokens_indices": tokens_indices, "tokens_indptr": tokens_indptr, "total_sq": total_sq,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    meta = {
+        "college": college,
+        "built_at": as_of or time.time(),
+        "students": [{"uid": s["uid"], "email": s.get("email")} for s in students],
+        "terms": terms,
+    }
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, separators=(",", ":"))
+    build_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(base, build_id)
+    os.rename(tmp_path, path)
+
+    previous = _read_current(base)
+    tmp = os.path.join(base, f".{CURRENT_FILE}.{build_id}.tmp")
+    with open(tmp, "w") as f:
+        f.write(build_id)
+    os.replace(tmp, os.path.join(base, CURRENT_FILE))
+
+    # Only once CURRENT has moved: drop superseded builds, except the previous one and any
+    # renamed in the last BUILD_GRACE_SECONDS (a reader or a concurrent build may be about
+    # to load them). Already-open memory maps stay valid after removal.
+    keep = {build_id, previous, _read_current(base), CURRENT_FILE}
+    now = time.time()
+    for name in os.listdir(base):
+        old_path = os.path.join(base, name)
+        if name in keep or name.startswith("."):
+            continue
+        try:
+            if now - os.path.getmtime(old_path) > BUILD_GRACE_SECONDS:
+                shutil.rmtree(old_path, ignore_errors=True)
+        except OSError:
+            pass  # removed by a concurrent build
+    logger.info(f"Student index for {college}: {len(students)} students, {len(terms)} terms")
+    return path
+
+
+class StudentIndex:
+    """A loaded (memory-mapped) college index."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        self.students = self.meta["students"]
+        self.terms = self.meta["terms"]
+        self.index = {t: i for i, t in enumerate(self.terms)}
+        shape = (len(self.students), len(self.terms))
+        indices, indptr = arrays["counts_indices"], arrays["counts_indptr"]
+        data = arrays["counts_data"]
+        self.counts = sparse.csr_matrix((data, indices, indptr), shape=shape)
+        # Same sparsity pattern with squared counts / with ones, for the shared-term sums of the pair-fit norms
+        self.counts_sq = sparse.csr_matrix((np.square(data, dtype=np.float64), indices, indptr), shape=shape)
+        self.counts_present = sparse.csr_matrix((np.ones(len(data)), indices, indptr), shape=shape)
+        tokens_indices = arrays["tokens_indices"]
+        self.tokens = sparse.csr_matrix(
+            (np.ones(len(tokens_indices)), tokens_indices, arrays["tokens_indptr"]), shape=shape
+        )
+        self.total_sq = arrays["total_sq"]
+        self._model_norms = None  # (model generation, idf over self.terms, per-student norms)
+
+    def __len__(self):
+        return len(self.students)
+
+    def _dense(self, items):
+        """Dense vector over the index vocabulary from (term, value) pairs; unknown terms are dropped."""
+        vec = np.zeros(len(self.terms))
+        for term, value in items:
+            column = self.index.get(term)
+            if column is not None:
+                vec[column] = value
+        return vec
+
+    def _pair_tfidf(self, jd_counts):
+        """resume_analysis.tfidf_cosine() of every student against the JD, 0-100."""
+        c2 = SINGLE_DOC_IDF ** 2
+        q = self._dense(jd_counts.items())
+        present = (q > 0).astype(np.float64)
+        dot = self.counts @ q
+        r_norm_sq = c2 * self.total_sq - (c2 - 1) * (self.counts_sq @ present)
+        j_total_sq = float(sum(n * n for n in jd_counts.values()))
+        j_norm_sq = c2 * j_total_sq - (c2 - 1) * (self.counts_present @ (q * q))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(dot > 0, dot / (np.sqrt(r_norm_sq) * np.sqrt(j_norm_sq)) * 100, 0.0)
+
+    def _model_tfidf(self, model, jd_counts):
+        """tfidf_model.CorpusTfidfModel.cosine() of every student against the JD, 0-100."""
+        if self._model_norms is None or self._model_norms[0] != model.generation:
+            idf = np.array([float(model.idf[model.index[t]]) if t in model.index else 0.0 for t in self.terms])
+            norms = np.sqrt(self.counts_sq @ (idf * idf))
+            self._model_norms = (model.generation, idf, norms)
+        _, idf, norms = self._model_norms
+        ids, weights = model.vector(jd_counts)
+        if not len(ids):
+            return np.zeros(len(self.students))
+        by_column = dict(zip(ids.tolist(), weights.tolist()))
+        q = self._dense((t, by_column.get(model.index[t], 0.0)) for t in jd_counts if t in model.index)
+        dot = self.counts @ (q * idf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(norms > 0, dot / norms * 100, 0.0)
+
+    def rank(self, profile, top_k=20, model=None):
+        """
+        The top_k students for a JD profile (resume_analysis.jd_profile), best first:
+        [{"uid", "email", "score", "missing_keywords"}], scored like resume_analysis.hybrid_score().
+        """
+        if not len(self.students):
+            return []
+        jd_counts = profile["term_counts"]
+        tfidf = self._model_tfidf(model, jd_counts) if model is not None else self._pair_tfidf(jd_counts)
+
+        keywords = sorted(profile["keywords"])
+        if keywords:
+            matched = self.tokens @ self._dense((kw, 1.0) for kw in keywords)
+            keyword_score = matched / len(keywords) * 100
+            final = np.where(tfidf < 15, keyword_score, 0.8 * keyword_score + 0.2 * tfidf)
+            raw, digits = np.minimum(final, 96.0), 1
+        else:
+            raw, digits = tfidf, 2
+        # Python's round() rather than np.round, so scores (and ties) match hybrid_score() exactly
+        scores = np.fromiter((round(v, digits) for v in raw.tolist()), dtype=np.float64, count=len(raw))
+
+        k = min(top_k, len(scores))
+        # k-th best score, then everything at least that good: ties at the cut-off resolve by index too
+        threshold = -np.partition(-scores, k - 1)[k - 1]
+        top = np.flatnonzero(scores >= threshold)
+        top = top[np.lexsort((top, -scores[top]))][:k]  # best first, ties in index order
+
+        ranked = []
+        for i in top.tolist():
+            row = set(self.tokens.indices[self.tokens.indptr[i]:self.tokens.indptr[i + 1]].tolist())
+            missing = sorted(kw.capitalize() for kw in keywords if self.index.get(kw) not in row)
+            student = self.students[i]
+            ranked.append({
+                "uid": student["uid"],
+                "email": student.get("email"),
+                "score": float(scores[i]),
+                "missing_keywords": missing[:MAX_MISSING_KEYWORDS],
+            })
+        return ranked
+
+
+class StudentIndexStore:
+    """
+    Loaded indexes by college. An index is rebuilt (in the background, see
+    get_or_refresh()) on the next request after invalidate() (a student of
+    the college analyzed a resume or changed college) or once it is older
+    than STUDENT_INDEX_MAX_AGE_MINUTES.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self._indexes = {}
+        self._invalid_before = {}   # college -> time of the last reported change
+        self._all_invalid_before = 0.0
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        self._refreshing = set()    # colleges with a background rebuild running
+        self.builds = 0
+
+    def _path(self, college):
+        base = os.path.join(self.index_dir, college_key(college))
+        build_id = _read_current(base)
+        return os.path.join(base, build_id) if build_id else None
+
+    def _is_current(self, college, index):
+        built_at = index.meta["built_at"]
+        if time.time() - built_at > STUDENT_INDEX_MAX_AGE_MINUTES * 60:
+            return False
+        return built_at > max(self._invalid_before.get(college, 0.0), self._all_invalid_before)
+
+    def _load(self, college):
+        """The college's loaded (or on-disk) index, current or not."""
+        with self._lock:
+            index = self._indexes.get(college)
+        if index is None:
+            path = self._path(college)
+            if path is None:
+                return None
+            try:
+                index = StudentIndex(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Student index for {college} not loaded: {e}")
+                return None
+            with self._lock:
+                self._indexes[college] = index
+        return index
+
+    def get(self, college):
+        """The college's index if it is current, else None (call build())."""
+        index = self._load(college)
+        return index if index is not None and self._is_current(college, index) else None
+
+    def get_or_refresh(self, college, load_students):
+        """
+        The college's index for a request. A current one is returned as is; a
+        stale one is still returned while a single background build replaces
+        it, so a resume upload does not put the full student scan in front of
+        the next ranking. Only a college without any index is built inline.
+        load_students: callable returning the students to index (see build()),
+        or None when they cannot be read (then whatever index exists, or None).
+        """
+        index = self.get(college)
+        if index is not None:
+            return index
+        previous = self._load(college)
+        if load_students is None:
+            return previous
+        if previous is None:
+            as_of = time.time()
+            return self.build(college, load_students(), as_of=as_of)
+        with self._lock:
+            if college in self._refreshing:
+                return previous
+            self._refreshing.add(college)
+        threading.Thread(
+            target=self._refresh, args=(college, load_students), name="student-index-refresh", daemon=True
+        ).start()
+        return previous
+
+    def _refresh(self, college, load_students):
+        try:
+            as_of = time.time()
+            index = self.build(college, load_students(), as_of=as_of)
+            print(f"✅ Rebuilt student index for {college} ({len(index)} students)")
+        except Exception as e:
+            logger.warning(f"Student index rebuild for {college} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(college)
+
+    def build(self, college, students, as_of=None):
+        """
+        as_of: when the students were read; changes reported after it keep the index stale.
+        Builds of one college are serialized; a caller that waited for a build of
+        students read no earlier than its own gets that index instead of building again.
+        """
+        as_of = as_of or time.time()
+        with self._lock:
+            build_lock = self._build_locks.setdefault(college, threading.Lock())
+        with build_lock:
+            index = self.get(college)
+            if index is not None and index.meta["built_at"] >= as_of:
+                return index
+            index = StudentIndex(build_index(college, students, self.index_dir, as_of=as_of))
+            with self._lock:
+                self._indexes[college] = index
+                self.builds += 1
+        return index
+
+    def invalidate(self, college=None):
+        """A student's resume or college changed: rebuild that college's index (or every index)."""
+        now = time.time()
+        with self._lock:
+            if college is None:
+                self._all_invalid_before = now
+            else:
+                self._invalid_before[college] = now
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": {c: len(i) for c, i in self._indexes.items()},
+                "stale": sorted(c for c, i in self._indexes.items() if not self._is_current(c, i)),
+                "refreshing": sorted(self._refreshing),
+                "builds": self.builds,
+            }
+
+
+student_indexes = StudentIndexStore(STUDENT_INDEX_DIR)
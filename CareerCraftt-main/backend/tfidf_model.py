@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import logging
+import threading
+
+import numpy as np
+
+# Corpus TF-IDF model: idf weights fitted offline on the job / placement
+# corpus (see fit_tfidf_model.py) instead of on each [resume, jd] pair.
+# Stored as a JSON term list + a .npy idf array that is memory-mapped, so
+# the API process and every resume_pipeline worker share the same pages.
+# When no model has been fitted, scoring keeps the two-document fit.
+
+logger = logging.getLogger(__name__)
+
+TFIDF_MODEL_DIR = os.getenv(
+    "TFIDF_MODEL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+)
+VOCAB_FILE = "tfidf_vocab.json"
+IDF_FILE = "tfidf_idf.npy"
+
+# Refit when the model is older than this, or when this share of the corpus has changed
+TFIDF_MODEL_MAX_AGE_HOURS = float(os.getenv("TFIDF_MODEL_MAX_AGE_HOURS", "24"))
+TFIDF_REFIT_CHANGE_RATIO = float(os.getenv("TFIDF_REFIT_CHANGE_RATIO", "0.1"))
+# How often a process checks the model files for a newer version
+RELOAD_CHECK_SECONDS = 30
+# Below this many documents corpus idf is no better than the pair fit
+MIN_CORPUS_DOCS = 20
+# Wait this long before retrying a failed background refit
+REFIT_RETRY_SECONDS = 3600
+
+
+def fit_model(documents, out_dir=None, min_df=1):
+    """
+    Fits TfidfVectorizer(stop_words='english') on the corpus and writes the
+    model files atomically (idf first, then the vocabulary that names it).
+    Returns the model metadata.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    out_dir = out_dir or TFIDF_MODEL_DIR
+    documents = [d for d in documents if d and d.strip()]
+    if len(documents) < MIN_CORPUS_DOCS:
+        raise ValueError(f"Corpus too small to fit ({len(documents)} documents, need {MIN_CORPUS_DOCS})")
+
+    vectorizer = TfidfVectorizer(stop_words="english", min_df=min_df, dtype=np.float32)
+    vectorizer.fit(documents)
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    idf = vectorizer.idf_.astype(np.float32)
+
+    meta = {
+        "fitted_at": time.time(),
+        "n_docs": len(documents),
+        "n_terms": len(terms),
+        "min_df": min_df,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    idf_tmp = os.path.join(out_dir, f".{IDF_FILE}.tmp")
+    with open(idf_tmp, "wb") as f:
+        np.save(f, idf)
+    vocab_tmp = os.path.join(out_dir, f".{VOCAB_FILE}.tmp")
+    with open(vocab_tmp, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "terms": terms}, f, separators=(",", ":"))
+    os.replace(idf_tmp, os.path.join(out_dir, IDF_FILE))
+    os.replace(vocab_tmp, os.path.join(out_dir, VOCAB_FILE))
+    logger.info(f"TF-IDF model fitted on {meta['n_docs']} documents, {meta['n_terms']} terms")
+    return meta
+
+
+class CorpusTfidfModel:
+    """A loaded model: term -> column index and a memory-mapped idf array."""
+
+    def __init__(self, terms, idf, meta, generation):
+        self.index = {term: i for i, term in enumerate(terms)}
+        self.idf = idf
+        self.meta = meta
+        self.generation = generation
+
+    @classmethod
+    def load(cls, model_dir, generation=0):
+        with open(os.path.join(model_dir, VOCAB_FILE), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        idf = np.load(os.path.join(model_dir, IDF_FILE), mmap_mode="r")
+        if len(idf) != len(data["terms"]):
+            # Caught between the two os.replace() calls of a refit; try again later
+            raise ValueError("TF-IDF model files are out of sync")
+        return cls(data["terms"], idf, data["meta"], generation)
+
+    def vector(self, counts):
+        """
+        l2-normalised tf-idf weights of a term-count Counter, as (column ids, weights):
+        what vectorizer.transform() yields. Terms outside the corpus are dropped.
+        """
+        known = [t for t in counts if t in self.index]
+        if not known:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        ids = np.fromiter((self.index[t] for t in known), dtype=np.int64, count=len(known))
+        tf = np.fromiter((counts[t] for t in known), dtype=np.float64, count=len(known))
+        weights = tf * self.idf[ids]
+        norm = np.sqrt(np.dot(weights, weights))
+        return ids, (weights / norm if norm else weights)
+
+    def cosine(self, resume_counts, jd_counts):
+        """Cosine similarity under the corpus idf, 0-100."""
+        r_ids, r_weights = self.vector(resume_counts)
+        j_ids, j_weights = self.vector(jd_counts)
+        if not len(r_ids) or not len(j_ids):
+            return 0.0
+        resume = dict(zip(r_ids.tolist(), r_weights.tolist()))
+        return float(sum(resume.get(i, 0.0) * w for i, w in zip(j_ids.tolist(), j_weights.tolist()))) * 100
+
+    def stats(self):
+        return {**self.meta, "generation": self.generation, "age_hours": round((time.time() - self.meta["fitted_at"]) / 3600, 2)}
+
+
+class TfidfModelStore:
+    """
+    Holds the current model for this process, reloading it when the files
+    change (checked at most every RELOAD_CHECK_SECONDS). In the API process,
+    enable_auto_refit() also refits in the background when the model is too
+    old or enough jobs/placements changed since the last fit.
+    """
+
+    def __init__(self, model_dir):
+        self.model_dir = model_dir
+        self.model = None
+        self.generation = 0
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load_documents = None
+        self._refitting = False
+        self._failed_at = 0.0
+        self.changes = 0
+        self.last_error = None
+
+    def _vocab_mtime(self):
+        try:
+            return os.stat(os.path.join(self.model_dir, VOCAB_FILE)).st_mtime
+        except OSError:
+            return None
+
+    def get(self):
+        """The current CorpusTfidfModel, or None when no model has been fitted."""
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_CHECK_SECONDS:
+            self._checked_at = now
+            self._maybe_reload()
+            self._maybe_refit()
+        return self.model
+
+    def _maybe_reload(self):
+        mtime = self._vocab_mtime()
+        if mtime is None or mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                model = CorpusTfidfModel.load(self.model_dir, self.generation + 1)
+            except (OSError, ValueError) as e:
+                logger.warning(f"TF-IDF model not loaded: {e}")
+                return
+            self.generation += 1
+            self.model = model
+            self._mtime = mtime
+            self.changes = 0
+            print(f"✅ Loaded TF-IDF model ({model.meta['n_terms']} terms from {model.meta['n_docs']} documents)")
+
+    # --- refresh (API process only) ---
+    def enable_auto_refit(self, load_documents):
+        """load_documents: callable returning the corpus (list of str) to refit on."""
+        self._load_documents = load_documents
+
+    def record_change(self, n=1):
+        """A job or placement was added / removed."""
+        self.changes += n
+        self._maybe_refit()
+
+    def needs_refit(self):
+        if self._load_documents is None or self.model is None:
+            # Without a model the pair fit is used; the first fit is an explicit offline step
+            return False
+        if self._failed_at and time.monotonic() - self._failed_at < REFIT_RETRY_SECONDS:
+            return False
+        age_hours = (time.time() - self.model.meta["fitted_at"]) / 3600
+        changed = self.changes / max(self.model.meta["n_docs"], 1)
+        return age_hours >= TFIDF_MODEL_MAX_AGE_HOURS or changed >= TFIDF_REFIT_CHANGE_RATIO
+
+    def _maybe_refit(self):
+        if self._refitting or not self.needs_refit():
+            return
+        self._refitting = True
+        threading.Thread(target=self._refit, name="tfidf-refit", daemon=True).start()
+
+    def _refit(self):
+        try:
+            fit_model(self._load_documents(), self.model_dir, min_df=self.model.meta.get("min_df", 1))
+            self.last_error = None
+            self._checked_at = 0.0  # pick the new files up on the next get()
+            self._maybe_reload()
+        except Exception as e:
+            self.last_error = str(e)
+            self._failed_at = time.monotonic()
+            logger.warning(f"TF-IDF model refit failed: {e}")
+        finally:
+            self._refitting = False
+
+    def stats(self):
+        return {
+            "model": self.model.stats() if self.model else None,
+            "changes_since_fit": self.changes,
+            "auto_refit": self._load_documents is not None,
+            "refitting": self._refitting,
+            "last_error": self.last_error,
+        }
+
+
+tfidf_store = TfidfModelStore(TFIDF_MODEL_DIR)
@@ -0,0 +1,195 @@
+import os
+import io
+import hashlib
+import logging
+import tempfile
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = int(float(os.getenv("RESUME_MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+# Uploads up to this size stay in memory; anything bigger is spooled to a temp file
+SPOOL_BYTES = int(os.getenv("RESUME_SPOOL_BYTES", str(1024 * 1024)))
+CHUNK_BYTES = 64 * 1024
+
+SNIFF_BYTES = 1024
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class UploadRejected(Exception):
+    """Upload refused before parsing (too large / not a PDF or DOCX)."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def sniff_kind(head):
+    """Identifies the file by its first bytes rather than its name."""
+    # PDF spec allows a little junk before the header
+    if PDF_MAGIC in head[:SNIFF_BYTES]:
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        return "zip"
+    return None
+
+
+class IngestedUpload:
+    """
+    A size-checked, hashed resume upload.
+    Small files are held as bytes; large ones live in a temp file that
+    extractors open and memory-map (see resume_analysis.open_source), so the
+    body is never copied into BytesIO.
+    """
+
+    def __init__(self, filename, kind, size, sha256, data=None, path=None):
+        self.original_filename = filename or ""
+        self.kind = kind
+        self.size = size
+        self.sha256 = sha256
+        self._data = data
+        self.path = path
+        # Extractors dispatch on the extension, so make it match the sniffed content
+        name = self.original_filename or "resume"
+        if not name.lower().endswith(f".{kind}"):
+            name = f"{name}.{kind}"
+        self.filename = name
+
+    @property
+    def source(self):
+        """What to hand to extract_resume(): a temp-file path or the bytes."""
+        return self.path if self.path else self._data
+
+    def read_bytes(self):
+        if self._data is not None:
+            return self._data
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self):
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _check_docx(stream):
+    try:
+        with zipfile.ZipFile(stream) as zf:
+            return "word/document.xml" in zf.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+class _Spooler:
+    """
+    Accumulates an upload chunk by chunk: sniffs the type from the first chunk,
+    enforces the size cap, hashes, and moves to a temp file past SPOOL_BYTES.
+    """
+
+    def __init__(self, filename, max_bytes):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.buffer = io.BytesIO()
+        self.spool = None
+        self.size = 0
+        self.kind = None
+
+    def feed(self, chunk):
+        if self.kind is None:
+            self.kind = sniff_kind(chunk)
+            if self.kind is None:
+                raise UploadRejected(415, "Unsupported file type. Please upload a PDF or DOCX.")
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(413, f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)} MB.")
+        self.digest.update(chunk)
+        if self.spool is None and self.size > SPOOL_BYTES:
+            self.spool = tempfile.NamedTemporaryFile(prefix="resume_", suffix=".upload", delete=False)
+            self.spool.write(self.buffer.getvalue())
+            self.buffer = None
+        if self.spool is not None:
+            self.spool.write(chunk)
+        else:
+            self.buffer.write(chunk)
+
+    def abort(self):
+        if self.spool is not None:
+            self.spool.close()
+            try:
+                os.remove(self.spool.name)
+            except OSError:
+                pass
+            self.spool = None
+
+    def finish(self):
+        if self.size == 0:
+            raise UploadRejected(400, "Uploaded file is empty.")
+
+        if self.spool is not None:
+            self.spool.close()
+            path, data = self.spool.name, None
+        else:
+            path, data = None, self.buffer.getvalue()
+
+        kind = self.kind
+        if kind == "zip":
+            ok = _check_docx(path) if path else _check_docx(io.BytesIO(data))
+            if not ok:
+                self.abort()
+                raise UploadRejected(415, "Unsupported file type. Please upload a PDF or DOCX.")
+            kind = "docx"
+
+        return IngestedUpload(self.filename, kind, self.size, self.digest.hexdigest(), data=data, path=path)
+
+
+async def ingest_upload(upload, max_bytes=None):
+    """
+    Reads an UploadFile in chunks: enforces the size cap, sniffs the content type
+    from the first bytes, hashes as it goes and spools large bodies to disk.
+    Raises UploadRejected (413 / 415) before any parser sees the file.
+    """
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+
+    declared = getattr(upload, "size", None)
+    if declared is not None and declared > max_bytes:
+        raise UploadRejected(413, f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB.")
+
+    spooler = _Spooler(upload.filename, max_bytes)
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            spooler.feed(chunk)
+        return spooler.finish()
+    except BaseException:
+        spooler.abort()
+        raise
+
+
+def ingest_stream(stream, filename, max_bytes=None):
+    """Synchronous twin of ingest_upload() for plain file objects (e.g. ZIP members)."""
+    spooler = _Spooler(filename, max_bytes or MAX_UPLOAD_BYTES)
+    try:
+        while True:
+            chunk = stream.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            spooler.feed(chunk)
+        return spooler.finish()
+    except BaseException:
+        spooler.abort()
+        raise